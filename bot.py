@@ -8,11 +8,18 @@ import requests
 import base64
 import struct
 import glob
+import hashlib
 import asyncio
+import heapq
+import sqlite3
+import threading
 import time
 import aiohttp
-from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Dict, Optional, List, Sequence
 
 import discord
 from discord import File, Intents, ButtonStyle, Embed
@@ -111,7 +118,17 @@ intents.guilds = True
 intents.messages = True
 intents.message_content = True
 intents.reactions = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+
+class WarframeBot(commands.Bot):
+    """Bot subclass that tears down shared resources on shutdown"""
+
+    async def close(self):
+        await shutdown_warframe_extension()
+        await super().close()
+
+
+bot = WarframeBot(command_prefix="!", intents=intents)
 
 # Global variables for relic system
 RELIC_DATA = {}
@@ -125,101 +142,217 @@ MAX_CONCURRENT_REQUESTS = 3  # Max 3 concurrent requests to respect rate limits
 # Persistent price cache configuration
 PRICE_CACHE_FILE = "platinum_price_cache.json"
 
+# Shared HTTP client configuration
+HTTP_CONNECTION_LIMIT = 50          # Total pooled connections
+HTTP_LIMIT_PER_HOST = 10            # Pooled connections per host
+HTTP_DNS_CACHE_TTL = 600            # Seconds to cache DNS lookups
+HTTP_KEEPALIVE_TIMEOUT = 75         # Seconds to keep idle connections open
+HTTP_WARMUP_URLS = [
+    "https://api.warframestat.us/",
+    "https://content.warframe.com/",
+    "https://api.warframe.market/",
+]
+
+# Worldstate endpoint selection and request hedging
+ENDPOINT_EWMA_ALPHA = 0.2           # Weight of the newest latency/success sample
+ENDPOINT_DEFAULT_LATENCY = 2.0      # Assumed latency (seconds) before any samples
+HEDGE_MIN_DELAY = 0.5               # Never hedge sooner than this (seconds)
+HEDGE_MAX_DELAY = 5.0               # Always hedge by this point (seconds)
+
+# Worldstate endpoint circuit breakers
+CIRCUIT_FAILURE_THRESHOLD = 3       # Consecutive failures before a circuit opens
+CIRCUIT_OPEN_SECONDS = 30           # First wait before probing an open circuit
+CIRCUIT_MAX_OPEN_SECONDS = 600      # Longest wait between probes of a dead endpoint
+CIRCUIT_PROBE_INTERVAL = 10         # How often the background prober runs (seconds)
+
+# Update scheduling: wake at the next expiry in the worldstate, within these bounds (seconds)
+UPDATE_MIN_INTERVAL = 20
+UPDATE_MAX_INTERVAL = 300           # Also the period of the old fixed loop, used as the metrics baseline
+UPDATE_EXPIRY_GRACE = 5             # Give the APIs a moment to roll over before refetching
+PIPELINE_SLOW_STAGE_SECONDS = 10    # Update stages slower than this are logged as warnings
+
+# Direct message delivery
+DM_OUTBOX_FILE = "dm_outbox.json"
+DM_WORKER_COUNT = 4
+DM_GLOBAL_RATE = 20                 # Sends per second across all workers (Discord's global limit is 50/s)
+DM_PER_USER_INTERVAL = 1.0          # DM channels allow 5 messages per 5 seconds
+DM_MAX_ATTEMPTS = 5
+DM_RETRY_BASE_DELAY = 2             # Seconds, doubled per attempt
+DM_RETRY_MAX_DELAY = 300
+
+# Resolved users and DM channels kept around between notifications
+USER_CACHE_SIZE = 2000
+USER_CACHE_TTL = 3600               # Seconds before a REST-fetched user is refetched
+DM_CHANNEL_CACHE_SIZE = 10000
+
+# Rendered embeds kept for reuse; a few panels per snapshot is plenty
+RENDER_CACHE_SIZE = 64
+
+# Channel panels: how far back the one-time reconciliation looks for existing bot messages
+RECONCILE_HISTORY_LIMIT = 50
+
+# Write-behind JSON persistence
+WRITE_BEHIND_DELAY = 2.0            # Seconds to coalesce changes before one write to disk
+
+# Notification digests: matches for a user are collected and sent as one DM
+NOTIFICATION_DIGEST_WINDOW = 0      # Extra seconds to hold digests; 0 sends once per update tick
+NOTIFICATION_DELIVERY_MODES = ("digest", "immediate")
+REMINDER_MAX_LEAD_MINUTES = 120     # Longest "notify me N minutes before" a subscription may ask for
+
+# Subscription storage; WAL lets reads carry on while the writer thread commits
+SUBSCRIPTIONS_DB_FILE = "warframe_subscriptions.db"
+SUBSCRIPTIONS_DB_SCHEMA = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+CREATE TABLE IF NOT EXISTS subscriptions (
+    user_id INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    details TEXT NOT NULL DEFAULT '',
+    mask INTEGER NOT NULL,
+    lead INTEGER NOT NULL DEFAULT 0,
+    added TEXT,
+    PRIMARY KEY (user_id, event_type, mask, lead)
+);
+CREATE INDEX IF NOT EXISTS subscriptions_by_event ON subscriptions (event_type, lead, mask);
+CREATE TABLE IF NOT EXISTS preferences (
+    user_id INTEGER PRIMARY KEY,
+    delivery TEXT NOT NULL
+);
+"""
+
+# Events already notified, so restarts don't re-announce them
+SEEN_EVENTS_FILE = "seen_events.json"
+SEEN_EVENTS_FLUSH_INTERVAL = 30     # Seconds between writes that only drop expired ids; new ones are written at once
+SEEN_EVENTS_DEFAULT_TTL = 86400     # For events that have no expiry of their own
+
+# Lookup tables for the raw DE worldstate (downloaded from WFCD, cached locally)
+WORLDSTATE_TABLES_FILE = "worldstate_tables.json"
+WORLDSTATE_TABLE_URLS = {
+    "nodes": "https://raw.githubusercontent.com/WFCD/warframe-worldstate-data/master/data/solNodes.json",
+    "sortie": "https://raw.githubusercontent.com/WFCD/warframe-worldstate-data/master/data/sortieData.json",
+}
+
+# Raw worldstate mission type codes
+RAW_MISSION_TYPES = {
+    "MT_ASSASSINATION": "Assassination",
+    "MT_EXTERMINATION": "Extermination",
+    "MT_SURVIVAL": "Survival",
+    "MT_RESCUE": "Rescue",
+    "MT_SABOTAGE": "Sabotage",
+    "MT_CAPTURE": "Capture",
+    "MT_INTEL": "Spy",
+    "MT_DEFENSE": "Defense",
+    "MT_MOBILE_DEFENSE": "Mobile Defense",
+    "MT_TERRITORY": "Interception",
+    "MT_RETRIEVAL": "Hijack",
+    "MT_HIVE": "Hive",
+    "MT_EXCAVATE": "Excavation",
+    "MT_EVACUATION": "Defection",
+    "MT_ASSAULT": "Assault",
+    "MT_ARENA": "Rathuum",
+    "MT_JUNCTION": "Junction",
+    "MT_PURSUIT": "Pursuit (Archwing)",
+    "MT_RACE": "Rush (Archwing)",
+    "MT_SECTOR": "Dark Sector",
+    "MT_LANDSCAPE": "Free Roam",
+    "MT_ARTIFACT": "Disruption",
+    "MT_CORRUPTION": "Void Flood",
+    "MT_VOID_CASCADE": "Void Cascade",
+    "MT_ARMAGEDDON": "Void Armageddon",
+    "MT_ALCHEMY": "Alchemy",
+}
+
+# Raw worldstate relic tier codes -> (tier name, tier number)
+RAW_VOID_TIERS = {
+    "VoidT1": ("Lith", 1),
+    "VoidT2": ("Meso", 2),
+    "VoidT3": ("Neo", 3),
+    "VoidT4": ("Axi", 4),
+    "VoidT5": ("Requiem", 5),
+    "VoidT6": ("Omnia", 6),
+}
+
+# Cetus bounties end with night; night is the last 50 minutes of the 150 minute cycle
+CETUS_NIGHT_SECONDS = 50 * 60
+
+# Open-world cycle engine: (states with durations in seconds, seed anchor epoch where the first state begins)
+# Seeds only matter until the first worldstate fetch re-anchors them; anchors are persisted afterwards
+CYCLE_ANCHORS_FILE = "cycle_anchors.json"
+CYCLE_REANCHOR_TOLERANCE = 30
+CYCLE_DEFINITIONS = {
+    "cetus": ((("day", 100 * 60), ("night", CETUS_NIGHT_SECONDS)), 1510444800),
+    "fortuna": ((("warm", 400), ("cold", 1200)), 1541837628),
+    "deimos": ((("fass", 100 * 60), ("vome", CETUS_NIGHT_SECONDS)), 1510444800),
+    "zariman": ((("corpus", 9000), ("grineer", 9000)), 1655182800),
+    "duviri": ((("sorrow", 7200), ("fear", 7200), ("joy", 7200), ("anger", 7200), ("envy", 7200)), 0),
+}
+
 # Global variables for Warframe information system
 warframe_data_manager = None
 subscription_manager = None
 embed_generator = None
 notification_manager = None
 channel_manager = None
+update_pipeline = None
+notification_dispatcher = None
+reminder_scheduler = None
+role_broadcast_manager = None
 
 # =============================================================================
 # ENHANCED TIME UTILITY FUNCTIONS
 # =============================================================================
 
-def parse_warframe_time_to_discord_timestamp(time_string):
+def parse_duration_seconds(time_string):
     """
-    Convert Warframe API time strings to Discord timestamp format
-    Examples: "2h 34m 12s", "1d 5h 23m", "45m 12s" -> Discord timestamps
+    Convert Warframe API duration strings to a number of seconds
+    Examples: "2h 34m 12s", "1d 5h 23m", "45m 12s" -> seconds
     """
-    # Add debug logging
-    logging.info(f"DEBUG: Raw time string received: '{time_string}' (type: {type(time_string)})")
-    
-    if not time_string or time_string == "Unknown" or time_string is None:
-        logging.warning(f"DEBUG: Invalid time string: {time_string}")
+    if not time_string or time_string == "Unknown":
+        return 0
+
+    total_seconds = 0
+    units = {'d': 86400, 'h': 3600, 'm': 60, 's': 1}
+    for value, unit in re.findall(r'(\d+)([dhms])', time_string.lower()):
+        total_seconds += int(value) * units[unit]
+    return total_seconds
+
+def parse_expiry_epoch(expiry_string):
+    """Convert an ISO timestamp from the API to an integer epoch, or None"""
+    if not expiry_string:
+        return None
+
+    try:
+        return int(datetime.fromisoformat(expiry_string.replace('Z', '+00:00')).timestamp())
+    except (TypeError, ValueError) as e:
+        logging.error(f"Error parsing expiry timestamp {expiry_string!r}: {e}")
+        return None
+
+def format_discord_timestamp(epoch, style="R"):
+    """Format an epoch as a Discord timestamp, e.g. <t:1700000000:R>"""
+    if not epoch:
         return "Unknown"
+    return f"<t:{int(epoch)}:{style}>"
 
-    # Parse the time string to extract hours, minutes, seconds
-    hours = 0
-    minutes = 0
-    seconds = 0
-
-    # Extract time components using regex
-    time_parts = re.findall(r'(\d+)([dhms])', time_string.lower())
-    logging.info(f"DEBUG: Parsed time parts: {time_parts}")
-    
-    for value, unit in time_parts:
-        value = int(value)
-        if unit == 'd':
-            hours += value * 24
-        elif unit == 'h':
-            hours += value
-        elif unit == 'm':
-            minutes += value
-        elif unit == 's':
-            seconds += value
-
-    # Calculate total seconds from now
-    total_seconds = hours * 3600 + minutes * 60 + seconds
-    logging.info(f"DEBUG: Total seconds calculated: {total_seconds}")
-    
+def format_time_remaining(epoch):
+    """Format the time until an epoch as "1h 2m 3s" """
+    if not epoch:
+        return "Unknown"
+
+    total_seconds = int(epoch - time.time())
     if total_seconds <= 0:
-        logging.warning(f"DEBUG: Invalid total seconds: {total_seconds}")
-        return time_string  # Return raw string if parsing failed
+        return "Expired"
 
-    # Get current timestamp and add the duration
-    current_timestamp = int(datetime.now().timestamp())
-    future_timestamp = current_timestamp + total_seconds
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
 
-    # Return Discord timestamp format for relative time
-    discord_timestamp = f"<t:{future_timestamp}:R>"
-    logging.info(f"DEBUG: Generated Discord timestamp: {discord_timestamp}")
-    return discord_timestamp
-    
-def calculate_eta_from_expiry(expiry_string):
-        """Calculate time remaining from ISO timestamp"""
-        if not expiry_string:
-            return "Unknown"
-    
-        try:
-            # Parse the ISO timestamp
-            expiry_time = datetime.fromisoformat(expiry_string.replace('Z', '+00:00'))
-            current_time = datetime.now(expiry_time.tzinfo)
-        
-            # Calculate difference
-            time_diff = expiry_time - current_time
-        
-            if time_diff.total_seconds() <= 0:
-                return "Expired"
-        
-            # Convert to hours, minutes, seconds format
-            total_seconds = int(time_diff.total_seconds())
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            seconds = total_seconds % 60
-        
-            # Format as string
-            if hours > 0:
-                return f"{hours}h {minutes}m {seconds}s"
-            elif minutes > 0:
-                return f"{minutes}m {seconds}s"
-            else:
-                return f"{seconds}s"
-            
-        except Exception as e:
-            logging.error(f"Error calculating ETA from expiry: {e}")
-            return "Unknown"
+    if hours > 0:
+        return f"{hours}h {minutes}m {seconds}s"
+    elif minutes > 0:
+        return f"{minutes}m {seconds}s"
+    else:
+        return f"{seconds}s"
 
-    
 def get_enemy_faction_icon(enemy):
     """Get the appropriate icon for an enemy faction"""
     enemy_lower = enemy.lower()
@@ -254,12 +387,1285 @@ def get_mission_type_icon(mission_type):
     else:
         return MISSION_TYPE_ICONS["normal"]
 
+# =============================================================================
+# RUNTIME METRICS
+# =============================================================================
+
+class BotMetrics:
+    """In-memory counters, gauges and timings for runtime monitoring"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.counters = {}
+        self.gauges = {}
+        self.timings = {}
+
+    def increment(self, name: str, amount: int = 1):
+        """Add to a monotonically increasing counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: float):
+        """Record the current value of something that goes up and down"""
+        self.gauges[name] = value
+
+    def observe(self, name: str, value: float):
+        """Record one sample of a timing or size distribution"""
+        stats = self.timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0})
+        stats["count"] += 1
+        stats["total"] += value
+        stats["max"] = max(stats["max"], value)
+        stats["last"] = value
+
+    def get(self, name: str, default=0):
+        """Get a counter or gauge value by name"""
+        if name in self.counters:
+            return self.counters[name]
+        return self.gauges.get(name, default)
+
+    def format_lines(self, prefix: str) -> List[str]:
+        """Format every metric under a dotted prefix for display"""
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            if name.startswith(prefix + "."):
+                lines.append(f"{name[len(prefix) + 1:]}: {value}")
+        for name, value in sorted(self.gauges.items()):
+            if name.startswith(prefix + "."):
+                lines.append(f"{name[len(prefix) + 1:]}: {round(value, 3)}")
+        for name, stats in sorted(self.timings.items()):
+            if name.startswith(prefix + "."):
+                avg = stats["total"] / stats["count"] if stats["count"] else 0
+                lines.append(
+                    f"{name[len(prefix) + 1:]}: avg {avg:.3f} / max {stats['max']:.3f} (n={stats['count']})"
+                )
+        return lines
+
+    def prefixes(self) -> List[str]:
+        """List the top-level metric groups that have data"""
+        names = list(self.counters) + list(self.gauges) + list(self.timings)
+        return sorted({name.split(".", 1)[0] for name in names})
+
+
+bot_metrics = BotMetrics()
+
+# =============================================================================
+# WRITE-BEHIND PERSISTENCE
+# =============================================================================
+
+class WriteBehindStore:
+    """Coalesces changes to a JSON file into one atomic write per WRITE_BEHIND_DELAY, done off the event loop"""
+
+    def __init__(self, path: str, snapshot, indent: int = 2):
+        self.path = path
+        # Returns the data to write; serialised on the loop so later changes can't tear it
+        self.snapshot = snapshot
+        self.indent = indent
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.dirty = False
+        self.timer = None
+        self.pending = None
+        self.lock = threading.Lock()
+
+    def mark(self):
+        """Note that the data changed; the write happens later"""
+        self.dirty = True
+        bot_metrics.increment(f"persistence.marks.{self.name}")
+        if self.timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Before the loop starts (or after it stops) there is nothing to defer to
+            self.write_file(self.serialise())
+            return
+        self.timer = loop.call_later(WRITE_BEHIND_DELAY, self.start_write)
+
+    def serialise(self) -> str:
+        self.dirty = False
+        return json.dumps(self.snapshot(), indent=self.indent, ensure_ascii=False)
+
+    def start_write(self):
+        self.timer = None
+        if not self.dirty:
+            return
+        loop = asyncio.get_running_loop()
+        # Writes of one file never overlap, so an older payload can't land after a newer one
+        if self.pending is not None and not self.pending.done():
+            self.timer = loop.call_later(WRITE_BEHIND_DELAY, self.start_write)
+            return
+        self.pending = loop.run_in_executor(None, self.write_file, self.serialise())
+
+    def write_file(self, payload: str):
+        """Write to a temp file, fsync, then rename over the original"""
+        started = time.perf_counter()
+        temp_path = f"{self.path}.tmp"
+        try:
+            with self.lock:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            bot_metrics.increment(f"persistence.writes.{self.name}")
+            bot_metrics.observe("persistence.write_seconds", time.perf_counter() - started)
+        except Exception as e:
+            bot_metrics.increment("persistence.errors")
+            logging.error(f"Error writing {self.path}: {e}")
+
+    async def flush(self):
+        """Write any pending change now and wait for it; used on shutdown"""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.pending is not None:
+            await self.pending
+        if self.dirty:
+            await asyncio.get_running_loop().run_in_executor(None, self.write_file, self.serialise())
+
+# =============================================================================
+# SHARED HTTP CLIENT
+# =============================================================================
+
+class HTTPClientManager:
+    """Owns the single pooled aiohttp session used for all outbound HTTP"""
+
+    def __init__(self, warmup_urls: List[str] = None):
+        self.warmup_urls = warmup_urls if warmup_urls is not None else HTTP_WARMUP_URLS
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_CONNECTION_LIMIT,
+                limit_per_host=HTTP_LIMIT_PER_HOST,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+            logging.info("Created shared HTTP session")
+        return self.session
+
+    async def warm_up(self):
+        """Open keep-alive connections to the hosts we talk to most"""
+        session = await self.get_session()
+
+        async def warm(url):
+            try:
+                async with session.head(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    logging.info(f"Warmed connection to {url} (status {response.status})")
+            except Exception as e:
+                logging.warning(f"Failed to warm connection to {url}: {e}")
+
+        await asyncio.gather(*(warm(url) for url in self.warmup_urls))
+
+    async def close(self):
+        """Close the shared session and its connection pool"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+            logging.info("Closed shared HTTP session")
+        self.session = None
+
+
+http_client_manager = HTTPClientManager()
+
+# =============================================================================
+# WORLDSTATE SNAPSHOT MODEL
+# =============================================================================
+
+class WorldstateRecord:
+    """Immutable, slot-based record; subclasses list their fields in __slots__"""
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def astuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.astuple() == other.astuple()
+
+    def __hash__(self):
+        return hash((type(self).__name__,) + self.astuple())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Fissure(WorldstateRecord):
+    __slots__ = ("id", "node", "mission_type", "enemy", "tier", "tier_num", "kind", "expiry", "filter_mask")
+
+
+class Cycle(WorldstateRecord):
+    __slots__ = ("location", "id", "state", "expiry")
+
+
+class SortieVariant(WorldstateRecord):
+    __slots__ = ("mission_type", "node", "modifier")
+
+
+class Sortie(WorldstateRecord):
+    __slots__ = ("id", "boss", "faction", "expiry", "variants")
+
+
+class Arbitration(WorldstateRecord):
+    __slots__ = ("node", "mission_type", "enemy", "expiry")
+
+
+class VoidTraderItem(WorldstateRecord):
+    __slots__ = ("item", "ducats", "credits")
+
+
+class VoidTrader(WorldstateRecord):
+    __slots__ = ("id", "character", "location", "active", "activation", "expiry", "inventory")
+
+
+class SteelPath(WorldstateRecord):
+    __slots__ = ("reward_name", "reward_cost", "expiry")
+
+
+class WorldstateSnapshot(WorldstateRecord):
+    """Everything the bot shows, parsed once per fetch and shared by all readers"""
+
+    __slots__ = (
+        "version", "fetched_at", "cycles", "fissures", "fissures_by_type",
+        "sortie", "arbitration", "void_trader", "steel_path", "counts", "active_systems",
+    )
+
+
+# Source keys for each open-world cycle in the parsed worldstate
+CYCLE_SOURCE_KEYS = {
+    "cetus": "cetusCycle",
+    "fortuna": "vallisCycle",
+    "deimos": "cambionCycle",
+    "zariman": "zarimanCycle",
+    "duviri": "duviriCycle",
+}
+
+FISSURE_KINDS = ("normal", "steel_path", "railjack")
+
+# Subscription filter dimensions; every value gets one bit, "other" catches anything unlisted
+FILTER_DIMENSIONS = {
+    "tier": ("lith", "meso", "neo", "axi", "requiem", "omnia", "other"),
+    "mission": (
+        "survival", "capture", "exterminate", "defense", "mobile_defense", "spy", "rescue",
+        "sabotage", "interception", "disruption", "excavation", "hive", "assault", "defection",
+        "hijack", "void_flood", "void_cascade", "void_armageddon", "alchemy", "other",
+    ),
+    "faction": ("grineer", "corpus", "infested", "corrupted", "crossfire", "murmur", "other"),
+    "kind": FISSURE_KINDS,
+}
+
+# API names and older spellings that differ from the filter values
+FILTER_VALUE_ALIASES = {
+    "extermination": "exterminate",
+    "the_murmur": "murmur",
+    "orokin": "corrupted",
+    # Spellings documented before filters used underscores, still present in old subscription files
+    "mobiledefense": "mobile_defense",
+    "voidflood": "void_flood",
+    "voidcascade": "void_cascade",
+    "voidarmageddon": "void_armageddon",
+    "steelpath": "steel_path",
+}
+
+FILTER_BITS = {}
+FILTER_DIMENSION_MASKS = {}
+for _dimension, _values in FILTER_DIMENSIONS.items():
+    FILTER_DIMENSION_MASKS[_dimension] = 0
+    for _value in _values:
+        FILTER_BITS[(_dimension, _value)] = 1 << len(FILTER_BITS)
+        FILTER_DIMENSION_MASKS[_dimension] |= FILTER_BITS[(_dimension, _value)]
+FILTER_ALL_MASK = sum(FILTER_DIMENSION_MASKS.values())
+
+
+def normalize_filter_value(dimension: str, value: str) -> str:
+    """Map an API or user-typed name onto a filter value, e.g. 'Mobile Defense' -> 'mobile_defense'"""
+    key = value.strip().lower().replace(" ", "_").replace("-", "_")
+    key = FILTER_VALUE_ALIASES.get(key, key)
+    return key if (dimension, key) in FILTER_BITS else "other"
+
+
+def encode_fissure_mask(tier: str, mission_type: str, enemy: str, kind: str) -> int:
+    """One bit per dimension, in the same space as compiled subscription filters"""
+    return (
+        FILTER_BITS[("tier", normalize_filter_value("tier", tier))]
+        | FILTER_BITS[("mission", normalize_filter_value("mission", mission_type))]
+        | FILTER_BITS[("faction", normalize_filter_value("faction", enemy))]
+        | FILTER_BITS[("kind", kind)]
+    )
+
+
+def parse_filter_details(event_details: str) -> Dict[str, tuple]:
+    """Split 'tier:neo,axi|mission:survival' into {dimension: values}; raises ValueError on unknown values"""
+    filters = {}
+    for part in (event_details or "").split("|"):
+        if ":" not in part:
+            continue
+        dimension, values = part.split(":", 1)
+        dimension = dimension.strip().lower()
+        if dimension not in FILTER_DIMENSIONS:
+            raise ValueError(f"Unknown filter '{dimension}'")
+
+        selected = []
+        for value in values.split(","):
+            key = value.strip().lower().replace(" ", "_").replace("-", "_")
+            if not key or key == "any":
+                continue
+            key = FILTER_VALUE_ALIASES.get(key, key)
+            if (dimension, key) not in FILTER_BITS:
+                valid = ", ".join(v for v in FILTER_DIMENSIONS[dimension] if v != "other")
+                raise ValueError(f"Unknown {dimension} '{value.strip()}'. Valid values: {valid}")
+            selected.append(key)
+        if selected:
+            filters[dimension] = tuple(v for v in FILTER_DIMENSIONS[dimension] if v in selected)
+    return filters
+
+
+def salvage_filter_details(event_details: str) -> Optional[Dict[str, tuple]]:
+    """Parse stored filters, dropping values that no longer parse; None if that would widen a dimension to 'any'"""
+    filters = {}
+    for part in (event_details or "").split("|"):
+        if ":" not in part:
+            continue
+        dimension, values = part.split(":", 1)
+        requested = [value for value in values.split(",") if value.strip() and value.strip().lower() != "any"]
+        selected = []
+        for value in requested:
+            try:
+                selected.extend(parse_filter_details(f"{dimension}:{value}").get(dimension.strip().lower(), ()))
+            except ValueError as e:
+                logging.warning(f"Dropping filter value from stored subscription '{event_details}': {e}")
+        if requested and not selected:
+            return None
+        if selected:
+            dimension = dimension.strip().lower()
+            merged = set(selected) | set(filters.get(dimension, ()))
+            filters[dimension] = tuple(v for v in FILTER_DIMENSIONS[dimension] if v in merged)
+    return filters
+
+
+def format_filter_details(filters: Dict[str, tuple]) -> str:
+    """Canonical details string, so equal filters always compare equal"""
+    return "|".join(
+        f"{dimension}:{','.join(filters[dimension])}"
+        for dimension in FILTER_DIMENSIONS if filters.get(dimension)
+    )
+
+
+def compile_filter_mask(filters: Dict[str, tuple]) -> int:
+    """A dimension with no values allows everything in it"""
+    mask = 0
+    for dimension, dimension_mask in FILTER_DIMENSION_MASKS.items():
+        values = filters.get(dimension)
+        if not values:
+            mask |= dimension_mask
+        else:
+            for value in values:
+                mask |= FILTER_BITS[(dimension, value)]
+    return mask
+
+# Subscription events matched against fissures, and the filters they imply
+FISSURE_EVENT_FILTERS = {
+    "fissure_missions": {},
+    "steel_path_fissures": {"kind": ("steel_path",)},
+}
+
+
+def build_worldstate_snapshot(data: Dict, version: int) -> WorldstateSnapshot:
+    """Parse a worldstate payload into an immutable snapshot"""
+    fetched_at = int(time.time())
+
+    cycles = {}
+    for location, source_key in CYCLE_SOURCE_KEYS.items():
+        cycle = data.get(source_key) or {}
+        if not cycle:
+            continue
+        expiry = parse_expiry_epoch(cycle.get("expiry"))
+        if expiry is None and cycle.get("timeLeft"):
+            expiry = fetched_at + parse_duration_seconds(cycle.get("timeLeft"))
+        cycles[location] = Cycle(
+            location=location,
+            id=cycle.get("id", ""),
+            state=cycle.get("state", "Unknown"),
+            expiry=expiry,
+        )
+
+    fissures = []
+    fissures_by_type = {kind: [] for kind in FISSURE_KINDS}
+    for fissure in data.get("fissures", []):
+        if fissure.get("isStorm", False):
+            kind = "railjack"
+        elif fissure.get("isHard", False):
+            kind = "steel_path"
+        else:
+            kind = "normal"
+        record = Fissure(
+            id=fissure.get("id", ""),
+            node=fissure.get("node", "Unknown"),
+            mission_type=fissure.get("missionType", "Unknown"),
+            enemy=fissure.get("enemy", "Unknown"),
+            tier=fissure.get("tier", "Unknown"),
+            tier_num=fissure.get("tierNum", 0),
+            kind=kind,
+            expiry=parse_expiry_epoch(fissure.get("expiry")),
+            filter_mask=encode_fissure_mask(
+                fissure.get("tier", ""), fissure.get("missionType", ""), fissure.get("enemy", ""), kind
+            ),
+        )
+        fissures.append(record)
+        fissures_by_type[kind].append(record)
+
+    sortie = None
+    sortie_data = data.get("sortie") or {}
+    if sortie_data:
+        sortie = Sortie(
+            id=sortie_data.get("id", ""),
+            boss=sortie_data.get("boss", "Unknown"),
+            faction=sortie_data.get("faction", "Unknown"),
+            expiry=parse_expiry_epoch(sortie_data.get("expiry")),
+            variants=tuple(
+                SortieVariant(
+                    mission_type=variant.get("missionType", "Unknown"),
+                    node=variant.get("node", "Unknown"),
+                    modifier=variant.get("modifier", "Unknown"),
+                )
+                for variant in sortie_data.get("variants", [])
+            ),
+        )
+
+    arbitration = None
+    arbitration_data = data.get("arbitration") or {}
+    if arbitration_data:
+        arbitration = Arbitration(
+            node=arbitration_data.get("node", "Unknown"),
+            mission_type=arbitration_data.get("type", "Unknown"),
+            enemy=arbitration_data.get("enemy", "Unknown"),
+            expiry=parse_expiry_epoch(arbitration_data.get("expiry")),
+        )
+
+    void_trader = None
+    trader_data = data.get("voidTrader") or {}
+    if trader_data:
+        void_trader = VoidTrader(
+            id=trader_data.get("id", ""),
+            character=trader_data.get("character", "Unknown"),
+            location=trader_data.get("location", "Unknown"),
+            active=trader_data.get("active", False),
+            activation=parse_expiry_epoch(trader_data.get("activation")),
+            expiry=parse_expiry_epoch(trader_data.get("expiry")),
+            inventory=tuple(
+                VoidTraderItem(
+                    item=item.get("item", "Unknown"),
+                    ducats=item.get("ducats", 0),
+                    credits=item.get("credits", 0),
+                )
+                for item in trader_data.get("inventory", [])
+            ),
+        )
+
+    steel_path = None
+    steel_path_data = data.get("steelPath") or {}
+    if steel_path_data:
+        current_reward = steel_path_data.get("currentReward") or {}
+        steel_path = SteelPath(
+            reward_name=current_reward.get("name"),
+            reward_cost=current_reward.get("cost", 0),
+            expiry=parse_expiry_epoch(steel_path_data.get("expiry")),
+        )
+
+    counts = {
+        "Fissures": len(data.get("fissures", [])),
+        "Invasions": len(data.get("invasions", [])),
+        "Events": len(data.get("events", [])),
+        "Alerts": len(data.get("alerts", [])),
+        "Kuva Missions": len(data.get("kuva", [])),
+    }
+
+    active_systems = []
+    if data.get("sortie"):
+        active_systems.append("Sortie")
+    if data.get("arbitration"):
+        active_systems.append("Arbitration")
+    if data.get("archonHunt"):
+        active_systems.append("Archon Hunt")
+    if data.get("nightwave"):
+        active_systems.append("Nightwave")
+
+    return WorldstateSnapshot(
+        version=version,
+        fetched_at=fetched_at,
+        cycles=MappingProxyType(cycles),
+        fissures=tuple(fissures),
+        fissures_by_type=MappingProxyType({kind: tuple(items) for kind, items in fissures_by_type.items()}),
+        sortie=sortie,
+        arbitration=arbitration,
+        void_trader=void_trader,
+        steel_path=steel_path,
+        counts=MappingProxyType(counts),
+        active_systems=tuple(active_systems),
+    )
+
+# =============================================================================
+# OPEN-WORLD CYCLE ENGINE
+# =============================================================================
+
+class CycleEngine:
+    """Computes open-world cycle states locally from fixed periods and persisted anchors"""
+
+    def __init__(self):
+        self.anchors = {location: seed for location, (_, seed) in CYCLE_DEFINITIONS.items()}
+        self.load_anchors()
+
+    def load_anchors(self):
+        """Load anchors learned from earlier runs"""
+        try:
+            if os.path.exists(CYCLE_ANCHORS_FILE):
+                with open(CYCLE_ANCHORS_FILE, "r") as f:
+                    stored = json.load(f)
+                for location, anchor in stored.items():
+                    if location in self.anchors:
+                        self.anchors[location] = int(anchor)
+                logging.info(f"Loaded cycle anchors for {len(stored)} locations")
+        except Exception as e:
+            logging.error(f"Error loading cycle anchors: {e}")
+
+    def save_anchors(self):
+        """Persist anchors so restarts don't fall back to the seeds"""
+        try:
+            with open(CYCLE_ANCHORS_FILE, "w") as f:
+                json.dump(self.anchors, f, indent=2)
+        except Exception as e:
+            logging.error(f"Error saving cycle anchors: {e}")
+
+    @staticmethod
+    def period(location: str) -> int:
+        states, _ = CYCLE_DEFINITIONS[location]
+        return sum(duration for _, duration in states)
+
+    def cycle_at(self, location: str, timestamp: float) -> Cycle:
+        """State and exact expiry of a location's cycle at the given time"""
+        states, seed = CYCLE_DEFINITIONS[location]
+        period = self.period(location)
+        anchor = self.anchors[location]
+
+        cycle_start = anchor + ((int(timestamp) - anchor) // period) * period
+        offset = int(timestamp) - cycle_start
+        state_end = cycle_start
+        for state, duration in states:
+            state_end += duration
+            if offset < state_end - cycle_start:
+                break
+
+        # Named after when the cycle ends, like the API's ids, but on the fixed seed grid: re-anchoring moves
+        # the anchor and not the seed, so the cycle in progress keeps its id and isn't notified twice
+        cycle_end = seed + round((cycle_start + period - seed) / period) * period
+        return Cycle(location=location, id=f"{location}Cycle{cycle_end}", state=state, expiry=state_end)
+
+    def next_state(self, location: str, state: str, after: float = None) -> Optional[tuple]:
+        """(start epoch, cycle) of the next time a location enters the given state"""
+        states, _ = CYCLE_DEFINITIONS[location]
+        cycle = self.cycle_at(location, time.time() if after is None else after)
+        for _ in states:
+            start = cycle.expiry
+            cycle = self.cycle_at(location, start)
+            if cycle.state == state:
+                return start, cycle
+        return None
+
+    def cycles_at(self, timestamp: float = None) -> Dict[str, Cycle]:
+        """Every location's cycle at the given time (default: now)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        return {location: self.cycle_at(location, timestamp) for location in CYCLE_DEFINITIONS}
+
+    def reanchor(self, observed: Dict[str, Cycle], observed_at: float = None):
+        """Check the engine against API cycles and correct anchors that drifted"""
+        observed_at = time.time() if observed_at is None else observed_at
+        changed = False
+
+        for location, cycle in observed.items():
+            if location not in CYCLE_DEFINITIONS or not cycle or not cycle.expiry:
+                continue
+            states, _ = CYCLE_DEFINITIONS[location]
+            state_names = [state for state, _ in states]
+            if cycle.state not in state_names:
+                continue
+
+            # Where the observed state ends within the cycle gives the cycle start
+            index = state_names.index(cycle.state)
+            end_offset = sum(duration for _, duration in states[:index + 1])
+            period = self.period(location)
+            new_anchor = (cycle.expiry - end_offset) % period
+
+            drift = (new_anchor - self.anchors[location]) % period
+            if drift > period / 2:
+                drift -= period
+            bot_metrics.set_gauge(f"cycles.drift_seconds.{location}", drift)
+
+            if abs(drift) > CYCLE_REANCHOR_TOLERANCE:
+                logging.info(f"🔁 Re-anchoring {location} cycle by {drift:+.0f}s")
+                self.anchors[location] = int(new_anchor)
+                bot_metrics.increment("cycles.reanchors")
+                changed = True
+
+        if changed:
+            self.save_anchors()
+
+# =============================================================================
+# WORLDSTATE DIFF ENGINE
+# =============================================================================
+
+class WorldstateEvent(WorldstateRecord):
+    """One change between consecutive worldstates; old/new are the records involved"""
+
+    __slots__ = ("kind", "key", "old", "new")
+
+
+WORLDSTATE_EVENT_KINDS = (
+    "fissure_added", "fissure_expired", "cycle_changed",
+    "sortie_rollover", "arbitration_rollover", "baro_arrived", "baro_departed",
+)
+
+
+class WorldstateDiffer:
+    """Compares consecutive worldstates and hands typed change events to subscribers"""
+
+    def __init__(self):
+        self.subscribers = {kind: [] for kind in WORLDSTATE_EVENT_KINDS}
+        # Called once after every dispatched batch, e.g. to flush notification digests
+        self.after_dispatch = []
+        self.previous_cycles = {}
+        self.previous_fissures = {}
+        self.previous_sortie = None
+        self.previous_arbitration = None
+        self.previous_trader = None
+
+    def subscribe(self, kind: str, handler):
+        """Register an async handler that receives a tuple of events of this kind"""
+        if kind not in self.subscribers:
+            raise ValueError(f"Unknown worldstate event kind: {kind}")
+        self.subscribers[kind].append(handler)
+
+    def diff(self, cycles: Dict[str, Cycle], snapshot: Optional[WorldstateSnapshot]) -> tuple:
+        """Events between the previous call and this one"""
+        events = []
+
+        for location, cycle in cycles.items():
+            previous = self.previous_cycles.get(location)
+            if previous is None or (previous.id, previous.state) != (cycle.id, cycle.state):
+                events.append(WorldstateEvent(kind="cycle_changed", key=location, old=previous, new=cycle))
+        self.previous_cycles = dict(cycles)
+
+        # Without a snapshot nothing is known about the worldstate, which is not the same as it being empty
+        if not snapshot:
+            return tuple(events)
+
+        fissures = {fissure.id: fissure for fissure in snapshot.fissures}
+        for fissure_id, fissure in fissures.items():
+            if fissure_id not in self.previous_fissures:
+                events.append(WorldstateEvent(kind="fissure_added", key=fissure_id, old=None, new=fissure))
+        for fissure_id, fissure in self.previous_fissures.items():
+            if fissure_id not in fissures:
+                events.append(WorldstateEvent(kind="fissure_expired", key=fissure_id, old=fissure, new=None))
+        self.previous_fissures = fissures
+
+        sortie = snapshot.sortie
+        if sortie and (self.previous_sortie is None or self.previous_sortie.id != sortie.id):
+            events.append(WorldstateEvent(kind="sortie_rollover", key=sortie.id, old=self.previous_sortie, new=sortie))
+        self.previous_sortie = sortie or self.previous_sortie
+
+        arbitration = snapshot.arbitration
+        if arbitration and arbitration != self.previous_arbitration:
+            events.append(WorldstateEvent(
+                kind="arbitration_rollover", key=arbitration.node, old=self.previous_arbitration, new=arbitration
+            ))
+        self.previous_arbitration = arbitration or self.previous_arbitration
+
+        trader = snapshot.void_trader
+        was_active = bool(self.previous_trader and self.previous_trader.active)
+        if trader and trader.active and not was_active:
+            events.append(WorldstateEvent(kind="baro_arrived", key=trader.id, old=self.previous_trader, new=trader))
+        elif trader and was_active and not trader.active:
+            events.append(WorldstateEvent(kind="baro_departed", key=trader.id, old=self.previous_trader, new=trader))
+        self.previous_trader = trader or self.previous_trader
+
+        return tuple(events)
+
+    async def dispatch(self, events: Sequence[WorldstateEvent]) -> int:
+        """Hand each subscriber the events of its kind; returns the number of handler calls"""
+        by_kind = {}
+        for event in events:
+            by_kind.setdefault(event.kind, []).append(event)
+
+        calls = [
+            (kind, handler(tuple(kind_events)))
+            for kind, kind_events in by_kind.items()
+            for handler in self.subscribers[kind]
+        ]
+        results = await asyncio.gather(*(call for _, call in calls), return_exceptions=True)
+        for (kind, _), result in zip(calls, results):
+            if isinstance(result, Exception):
+                logging.error(f"Error handling {kind} events: {result}")
+
+        for kind, kind_events in by_kind.items():
+            bot_metrics.increment(f"events.{kind}", len(kind_events))
+
+        for callback in self.after_dispatch:
+            try:
+                callback()
+            except Exception as e:
+                logging.error(f"Error after dispatching worldstate events: {e}")
+        return len(calls)
+
+# =============================================================================
+# RAW WORLDSTATE NORMALISER
+# =============================================================================
+
+def raw_date_to_iso(raw_date) -> Optional[str]:
+    """Convert a raw {"$date": {"$numberLong": "..."}} value to an ISO timestamp"""
+    try:
+        millis = int(raw_date["$date"]["$numberLong"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return datetime.fromtimestamp(millis / 1000, tz=timezone.utc).isoformat()
+
+def humanize_raw_code(code: str, prefixes=()) -> str:
+    """Best-effort readable name for an unknown raw code, e.g. SORTIE_BOSS_VOR -> Vor"""
+    if not code:
+        return "Unknown"
+    for prefix in prefixes:
+        if code.startswith(prefix):
+            code = code[len(prefix):]
+    code = code.rsplit("/", 1)[-1]
+    # Split CamelCase item paths as well as SNAKE_CASE codes
+    code = re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', code).replace("_", " ")
+    return code.strip().title() or "Unknown"
+
+class RawWorldstateNormalizer:
+    """Translates DE's raw worldState.php into the parsed (WFCD) worldstate shape"""
+
+    def __init__(self):
+        self.nodes = {}
+        self.sortie_bosses = {}
+        self.sortie_modifiers = {}
+
+    def load_tables(self, tables: Dict):
+        """Install node and sortie lookup tables"""
+        self.nodes = tables.get("nodes", {}) or {}
+        sortie = tables.get("sortie", {}) or {}
+        self.sortie_bosses = sortie.get("bosses", {}) or {}
+        self.sortie_modifiers = sortie.get("modifierTypes", {}) or {}
+        logging.info(f"Loaded worldstate tables: {len(self.nodes)} nodes, {len(self.sortie_bosses)} sortie bosses")
+
+    def node_name(self, node: str) -> str:
+        return self.nodes.get(node, {}).get("value", node or "Unknown")
+
+    def node_enemy(self, node: str) -> str:
+        return self.nodes.get(node, {}).get("enemy", "Unknown")
+
+    def node_mission_type(self, node: str) -> str:
+        return self.nodes.get(node, {}).get("type", "Unknown")
+
+    def normalize(self, raw: Dict) -> Dict:
+        """Build a parsed-style worldstate dict from a raw payload"""
+        now = time.time()
+        data = {"fissures": []}
+
+        for mission in raw.get("ActiveMissions", []):
+            tier, tier_num = RAW_VOID_TIERS.get(mission.get("Modifier"), ("Unknown", 0))
+            node = mission.get("Node", "")
+            data["fissures"].append({
+                "id": mission.get("_id", {}).get("$oid", ""),
+                "node": self.node_name(node),
+                "missionType": RAW_MISSION_TYPES.get(
+                    mission.get("MissionType"), humanize_raw_code(mission.get("MissionType"), ("MT_",))
+                ),
+                "enemy": self.node_enemy(node),
+                "tier": tier,
+                "tierNum": tier_num,
+                "expiry": raw_date_to_iso(mission.get("Expiry")),
+                "isStorm": False,
+                "isHard": bool(mission.get("Hard", False)),
+            })
+
+        for storm in raw.get("VoidStorms", []):
+            tier, tier_num = RAW_VOID_TIERS.get(storm.get("ActiveMissionTier"), ("Unknown", 0))
+            node = storm.get("Node", "")
+            data["fissures"].append({
+                "id": storm.get("_id", {}).get("$oid", ""),
+                "node": self.node_name(node),
+                "missionType": self.node_mission_type(node),
+                "enemy": self.node_enemy(node),
+                "tier": tier,
+                "tierNum": tier_num,
+                "expiry": raw_date_to_iso(storm.get("Expiry")),
+                "isStorm": True,
+                "isHard": False,
+            })
+
+        sorties = raw.get("Sorties", [])
+        if sorties:
+            sortie = sorties[0]
+            boss = self.sortie_bosses.get(sortie.get("Boss"), {})
+            data["sortie"] = {
+                "id": sortie.get("_id", {}).get("$oid", ""),
+                "boss": boss.get("name", humanize_raw_code(sortie.get("Boss"), ("SORTIE_BOSS_",))),
+                "faction": boss.get("faction", "Unknown"),
+                "expiry": raw_date_to_iso(sortie.get("Expiry")),
+                "variants": [
+                    {
+                        "missionType": RAW_MISSION_TYPES.get(
+                            variant.get("missionType"), humanize_raw_code(variant.get("missionType"), ("MT_",))
+                        ),
+                        "modifier": self.sortie_modifiers.get(
+                            variant.get("modifierType"),
+                            humanize_raw_code(variant.get("modifierType"), ("SORTIE_MODIFIER_",))
+                        ),
+                        "node": self.node_name(variant.get("node", "")),
+                    }
+                    for variant in sortie.get("Variants", [])
+                ],
+            }
+
+        traders = raw.get("VoidTraders", [])
+        if traders:
+            trader = traders[0]
+            activation = raw_date_to_iso(trader.get("Activation"))
+            expiry = raw_date_to_iso(trader.get("Expiry"))
+            activation_epoch = parse_expiry_epoch(activation) or 0
+            expiry_epoch = parse_expiry_epoch(expiry) or 0
+            data["voidTrader"] = {
+                "id": trader.get("_id", {}).get("$oid", ""),
+                "character": trader.get("Character", "Baro Ki'Teer"),
+                "location": self.node_name(trader.get("Node", "")),
+                "activation": activation,
+                "expiry": expiry,
+                "active": activation_epoch <= now < expiry_epoch,
+                "inventory": [
+                    {
+                        "item": humanize_raw_code(item.get("ItemType", "")),
+                        "ducats": item.get("PrimePrice", 0),
+                        "credits": item.get("RegularPrice", 0),
+                    }
+                    for item in trader.get("Manifest", [])
+                ],
+            }
+
+        # Cetus and the Cambion Drift follow the Cetus bounty timer
+        for mission in raw.get("SyndicateMissions", []):
+            if mission.get("Tag") != "CetusSyndicate":
+                continue
+            bounty_expiry = parse_expiry_epoch(raw_date_to_iso(mission.get("Expiry")))
+            if not bounty_expiry:
+                break
+            is_day = now < bounty_expiry - CETUS_NIGHT_SECONDS
+            state_expiry = bounty_expiry - CETUS_NIGHT_SECONDS if is_day else bounty_expiry
+            expiry_iso = datetime.fromtimestamp(state_expiry, tz=timezone.utc).isoformat()
+            cycle_id = f"cetusCycle{state_expiry}"
+            data["cetusCycle"] = {"id": cycle_id, "state": "day" if is_day else "night", "expiry": expiry_iso}
+            data["cambionCycle"] = {"id": cycle_id, "state": "fass" if is_day else "vome", "expiry": expiry_iso}
+            break
+
+        return data
+
+async def fetch_and_save_worldstate_tables() -> Dict:
+    """Download the node and sortie lookup tables and cache them on disk"""
+    session = await http_client_manager.get_session()
+    tables = {}
+    for name, url in WORLDSTATE_TABLE_URLS.items():
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            response.raise_for_status()
+            tables[name] = await response.json(content_type=None)
+    
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, save_worldstate_tables_file, tables)
+    return tables
+
+def save_worldstate_tables_file(tables: Dict):
+    """Write worldstate lookup tables to disk"""
+    with open(WORLDSTATE_TABLES_FILE, "w", encoding="utf-8") as f:
+        json.dump(tables, f, ensure_ascii=False)
+
+def load_worldstate_tables() -> Optional[Dict]:
+    """Load cached worldstate lookup tables, if present"""
+    try:
+        if os.path.exists(WORLDSTATE_TABLES_FILE):
+            with open(WORLDSTATE_TABLES_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except Exception as e:
+        logging.error(f"Error loading worldstate tables: {e}")
+    return None
+
+# =============================================================================
+# USER CACHE
+# =============================================================================
+
+class UserCache:
+    """Resolves user ids to users and DM channels: gateway cache, then a TTL'd LRU, then REST"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.users = OrderedDict()          # user id -> (user, fetched at)
+        self.dm_channels = OrderedDict()    # user id -> DMChannel
+        self.inflight = {}                  # (kind, user id) -> running REST task
+
+    async def get_user(self, user_id: int):
+        """Resolve a user, only hitting the REST API when nobody has it cached"""
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            bot_metrics.increment("users.gateway_hits")
+            return user
+
+        cached = self.users.get(user_id)
+        if cached and time.monotonic() - cached[1] < USER_CACHE_TTL:
+            self.users.move_to_end(user_id)
+            bot_metrics.increment("users.cache_hits")
+            return cached[0]
+
+        user = await self.single_flight(("user", user_id), lambda: self.fetch_user(user_id))
+        self.users[user_id] = (user, time.monotonic())
+        self.users.move_to_end(user_id)
+        while len(self.users) > USER_CACHE_SIZE:
+            self.users.popitem(last=False)
+        return user
+
+    async def get_dm_channel(self, user_id: int):
+        """Resolve a user's DM channel, opening it once and keeping it for later notifications"""
+        channel = self.dm_channels.get(user_id)
+        if channel is not None:
+            self.dm_channels.move_to_end(user_id)
+            bot_metrics.increment("users.dm_channel_hits")
+            return channel
+
+        channel = await self.single_flight(("dm", user_id), lambda: self.open_dm_channel(user_id))
+        self.dm_channels[user_id] = channel
+        while len(self.dm_channels) > DM_CHANNEL_CACHE_SIZE:
+            self.dm_channels.popitem(last=False)
+        return channel
+
+    async def fetch_user(self, user_id: int):
+        bot_metrics.increment("users.rest_fetches")
+        return await self.bot.fetch_user(user_id)
+
+    async def open_dm_channel(self, user_id: int):
+        user = await self.get_user(user_id)
+        if user.dm_channel is not None:
+            return user.dm_channel
+        bot_metrics.increment("users.dm_channel_opens")
+        return await user.create_dm()
+
+    async def single_flight(self, key: tuple, factory):
+        """Workers resolving the same user share one REST call"""
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def get_display_name(self, user_id, default: str = None) -> str:
+        """Best available name for a user id (or stored identifier), or the default if it can't be resolved"""
+        try:
+            # Relic files can also be stored under usernames, which int() rejects here
+            user = await self.get_user(int(user_id))
+            return user.display_name or user.global_name or user.name
+        except Exception:
+            return default or f"User_{user_id}"
+
+user_cache = UserCache(bot)
+
+# =============================================================================
+# DM DELIVERY DISPATCHER
+# =============================================================================
+
+class RateLimiter:
+    """Token bucket shared by all DM workers"""
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class NotificationDispatcher:
+    """Queues DMs and delivers them from a worker pool, within Discord's rate limits"""
+
+    def __init__(self, bot, users: UserCache, worker_count: int = DM_WORKER_COUNT):
+        self.bot = bot
+        self.users = users
+        self.worker_count = worker_count
+        self.queue = asyncio.Queue()
+        self.rate_limiter = RateLimiter(DM_GLOBAL_RATE)
+        # Undelivered notifications by id, mirrored to the outbox file
+        self.pending = {}
+        # Users whose DMs are closed; cleared when they interact with the bot again
+        self.closed_dms = set()
+        # user id -> earliest next send; every deadline is now + DM_PER_USER_INTERVAL, so the oldest come first
+        self.user_next_send = OrderedDict()
+        self.sent_times = deque(maxlen=1000)
+        self.workers = []
+        self.outbox_store = WriteBehindStore(DM_OUTBOX_FILE, self.outbox_snapshot, indent=None)
+        self.next_id = 0
+
+    def load_outbox(self):
+        """Restore notifications that were still queued at shutdown"""
+        try:
+            if os.path.exists(DM_OUTBOX_FILE):
+                with open(DM_OUTBOX_FILE, "r") as f:
+                    outbox = json.load(f)
+                self.closed_dms = set(outbox.get("closed_dms", []))
+                for item in outbox.get("pending", []):
+                    self.pending[item["id"]] = item
+                    self.next_id = max(self.next_id, item["id"] + 1)
+                logging.info(f"📬 Restored {len(self.pending)} queued notifications from outbox")
+        except Exception as e:
+            logging.error(f"Error loading DM outbox: {e}")
+
+    def outbox_snapshot(self) -> dict:
+        """Pending notifications and closed-DM users, as written to the outbox file"""
+        return {"pending": list(self.pending.values()), "closed_dms": sorted(self.closed_dms)}
+
+    def save_outbox(self):
+        """Schedule an outbox write; changes are batched instead of rewriting the file per message"""
+        self.outbox_store.mark()
+
+    def start(self):
+        """Load the outbox and start the workers"""
+        if self.workers:
+            return
+        self.load_outbox()
+        for item in self.pending.values():
+            self.queue.put_nowait(item)
+        self.workers = [asyncio.ensure_future(self.worker()) for _ in range(self.worker_count)]
+        bot_metrics.set_gauge("dm.queue_depth", self.queue.qsize())
+
+    async def stop(self):
+        """Stop the workers and persist whatever is still queued"""
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        self.save_outbox()
+        await self.outbox_store.flush()
+
+    def enqueue(self, user_id: int, content: str = None, embed: Embed = None) -> bool:
+        """Queue a DM; returns False if the user has closed DMs"""
+        if user_id in self.closed_dms:
+            bot_metrics.increment("dm.suppressed")
+            return False
+
+        item = {
+            "id": self.next_id,
+            "user_id": user_id,
+            "content": content,
+            "embed": embed.to_dict() if embed else None,
+            "created": time.time(),
+            "attempts": 0,
+        }
+        self.next_id += 1
+        self.pending[item["id"]] = item
+        self.save_outbox()
+        self.queue.put_nowait(item)
+        bot_metrics.increment("dm.queued")
+        bot_metrics.set_gauge("dm.queue_depth", self.queue.qsize())
+        return True
+
+    def allow_user(self, user_id: int):
+        """Resume delivery to a user, e.g. after they subscribe again"""
+        if user_id in self.closed_dms:
+            self.closed_dms.discard(user_id)
+            self.save_outbox()
+
+    async def worker(self):
+        while True:
+            item = await self.queue.get()
+            try:
+                await self.deliver(item)
+            except Exception as e:
+                logging.error(f"Unexpected error delivering DM to {item['user_id']}: {e}")
+                self.finish(item)
+            finally:
+                self.queue.task_done()
+                bot_metrics.set_gauge("dm.queue_depth", self.queue.qsize())
+
+    async def deliver(self, item: dict):
+        user_id = item["user_id"]
+        if user_id in self.closed_dms:
+            bot_metrics.increment("dm.suppressed")
+            self.finish(item)
+            return
+
+        # Space out messages to the same DM channel (its own route limit)
+        wait = self.user_next_send.get(user_id, 0) - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        now = time.monotonic()
+        # Forget users whose spacing has already passed, so this stays as small as the recent senders
+        while self.user_next_send and next(iter(self.user_next_send.values())) <= now:
+            self.user_next_send.popitem(last=False)
+        self.user_next_send[user_id] = now + DM_PER_USER_INTERVAL
+        self.user_next_send.move_to_end(user_id)
+        await self.rate_limiter.acquire()
+
+        item["attempts"] += 1
+        try:
+            channel = await self.users.get_dm_channel(user_id)
+            embed = Embed.from_dict(item["embed"]) if item["embed"] else None
+            await channel.send(content=item["content"], embed=embed)
+        except discord.Forbidden:
+            logging.info(f"🔕 User {user_id} has closed DMs, suppressing notifications")
+            self.closed_dms.add(user_id)
+            bot_metrics.increment("dm.forbidden")
+            self.finish(item)
+        except discord.NotFound:
+            bot_metrics.increment("dm.dropped")
+            self.finish(item)
+        except discord.HTTPException as e:
+            if e.status == 429 or e.status >= 500:
+                self.retry(item, getattr(e, "retry_after", None))
+            else:
+                logging.warning(f"Failed to notify user {user_id}: {e}")
+                bot_metrics.increment("dm.dropped")
+                self.finish(item)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.warning(f"Network error notifying user {user_id}: {e}")
+            self.retry(item)
+        else:
+            now = time.time()
+            self.sent_times.append(now)
+            while self.sent_times and self.sent_times[0] < now - 60:
+                self.sent_times.popleft()
+            bot_metrics.increment("dm.sent")
+            bot_metrics.set_gauge("dm.sent_per_minute", len(self.sent_times))
+            bot_metrics.observe("dm.delivery_latency_seconds", now - item["created"])
+            self.finish(item)
+
+    def retry(self, item: dict, retry_after: float = None):
+        """Requeue with exponential backoff, or give up after DM_MAX_ATTEMPTS"""
+        if item["attempts"] >= DM_MAX_ATTEMPTS:
+            logging.warning(f"Giving up on DM to {item['user_id']} after {item['attempts']} attempts")
+            bot_metrics.increment("dm.dropped")
+            self.finish(item)
+            return
+
+        delay = retry_after or min(DM_RETRY_BASE_DELAY * 2 ** (item["attempts"] - 1), DM_RETRY_MAX_DELAY)
+        bot_metrics.increment("dm.retries")
+        self.save_outbox()
+        asyncio.get_running_loop().call_later(delay, self.queue.put_nowait, item)
+
+    def finish(self, item: dict):
+        self.pending.pop(item["id"], None)
+        self.save_outbox()
+
 # =============================================================================
 # ENHANCED WARFRAME INFORMATION SYSTEM CLASSES
 # =============================================================================
 
-class WarframeDataManager:
+class CircuitBreaker:
+    """Closed/open/half-open circuit for one API endpoint"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self):
+        self.state = self.CLOSED
+        self.open_seconds = CIRCUIT_OPEN_SECONDS
+        self.retry_at = 0.0
+        self.changed_at = time.time()
+
+    def allows_requests(self) -> bool:
+        """Only closed circuits are used for user-facing fetches"""
+        return self.state == self.CLOSED
+
+    def ready_for_probe(self) -> bool:
+        return self.state == self.OPEN and time.time() >= self.retry_at
+
+    def transition(self, new_state: str) -> Optional[str]:
+        """Move to a new state, returning the old state if it changed"""
+        if new_state == self.state:
+            return None
+        old_state = self.state
+        self.state = new_state
+        self.changed_at = time.time()
+        if new_state == self.OPEN:
+            self.retry_at = self.changed_at + self.open_seconds
+        return old_state
+
+    def record_success(self) -> Optional[str]:
+        self.open_seconds = CIRCUIT_OPEN_SECONDS
+        return self.transition(self.CLOSED)
+
+    def record_failure(self, failure_count: int) -> Optional[str]:
+        if self.state == self.HALF_OPEN:
+            # Probe failed, back off before the next one
+            self.open_seconds = min(self.open_seconds * 2, CIRCUIT_MAX_OPEN_SECONDS)
+            return self.transition(self.OPEN)
+        if failure_count >= CIRCUIT_FAILURE_THRESHOLD:
+            return self.transition(self.OPEN)
+        return None
+
+class EndpointStats:
+    """Exponentially weighted latency and success rate for one API endpoint"""
+
     def __init__(self):
+        self.latency_ewma = ENDPOINT_DEFAULT_LATENCY
+        self.latency_variance = 0.0
+        self.success_rate = 1.0
+        self.samples = 0
+
+    def record(self, latency: float, success: bool):
+        """Fold one request outcome into the running averages"""
+        if self.samples == 0:
+            self.latency_ewma = latency
+        else:
+            deviation = latency - self.latency_ewma
+            self.latency_ewma += ENDPOINT_EWMA_ALPHA * deviation
+            self.latency_variance = (1 - ENDPOINT_EWMA_ALPHA) * (
+                self.latency_variance + ENDPOINT_EWMA_ALPHA * deviation * deviation
+            )
+        self.success_rate += ENDPOINT_EWMA_ALPHA * ((1.0 if success else 0.0) - self.success_rate)
+        self.samples += 1
+
+    def record_success(self, latency: float):
+        self.record(latency, True)
+
+    def record_failure(self, latency: float):
+        self.record(latency, False)
+
+    def p95(self) -> float:
+        """Estimated 95th percentile latency, used as the hedging delay"""
+        estimate = self.latency_ewma + 1.645 * (self.latency_variance ** 0.5)
+        return min(max(estimate, HEDGE_MIN_DELAY), HEDGE_MAX_DELAY)
+
+    def score(self) -> float:
+        """Expected time to a successful answer; lower is better"""
+        return self.latency_ewma / max(self.success_rate, 0.05)
+
+
+class WarframeDataManager:
+    def __init__(self, http_client: HTTPClientManager):
+        self.http_client = http_client
+
         # NEW: Multiple API endpoints for fallback
         self.api_endpoints = [
             {
@@ -287,12 +1693,38 @@ class WarframeDataManager:
         self.cache_duration = 300
         self.last_fetch = {}
         
+        # Stale copies are served (while refreshing) until this hard limit
+        self.max_staleness = 900
+        
+        # ETag/Last-Modified per cache key, with the endpoint they came from
+        self.cache_validators = {}
+        
+        # Local cycle calculator, re-anchored from each new snapshot
+        self.cycle_engine = CycleEngine()
+        
+        # Translates the raw DE endpoint into the parsed shape
+        self.raw_normalizer = RawWorldstateNormalizer()
+        
+        # Parsed view of the root worldstate, rebuilt only when the payload changes
+        self.snapshot: Optional[WorldstateSnapshot] = None
+        self.snapshot_source = None
+        self.snapshot_version = 0
+        
         # NEW: Add these for API tracking
         self.last_successful_api = None
         self.api_failure_count = {}
         
+        self.endpoint_stats = {}
+        self.circuit_breakers = {}
+        self.circuit_transitions = deque(maxlen=10)
+        
         for i, endpoint in enumerate(self.api_endpoints):
             self.api_failure_count[i] = 0
+            self.endpoint_stats[i] = EndpointStats()
+            self.circuit_breakers[i] = CircuitBreaker()
+
+        # In-flight fetches keyed by cache key, shared by concurrent callers
+        self.inflight_fetches: Dict[str, asyncio.Task] = {}
 
     # NEW: Add this method
     def get_current_api_status(self):
@@ -315,162 +1747,431 @@ class WarframeDataManager:
         """Fetch data from Warframe APIs with fallback support"""
     
         cache_key = endpoint if endpoint else "root"
-        if (cache_key in self.cache and
-            cache_key in self.last_fetch and
-            datetime.now() - self.last_fetch[cache_key] < timedelta(seconds=self.cache_duration)):
-            return self.cache[cache_key]
+        bot_metrics.increment("worldstate.fetch_calls")
+        if cache_key in self.cache and cache_key in self.last_fetch:
+            age = datetime.now() - self.last_fetch[cache_key]
+            if age < timedelta(seconds=self.cache_duration):
+                bot_metrics.increment("worldstate.cache_hits")
+                return self.cache[cache_key]
+            
+            # Stale but still usable: answer now and revalidate in the background
+            if age < timedelta(seconds=self.max_staleness):
+                bot_metrics.increment("worldstate.stale_hits")
+                self.start_fetch(endpoint, cache_key)
+                return self.cache[cache_key]
+
+        # Join a fetch that is already running for this key instead of starting another
+        if cache_key in self.inflight_fetches:
+            bot_metrics.increment("worldstate.coalesced_calls")
+        # Shield so a cancelled caller does not cancel the fetch for everyone else
+        return await asyncio.shield(self.start_fetch(endpoint, cache_key))
+
+    async def refresh(self, endpoint: str = "") -> Optional[Dict]:
+        """Fetch now regardless of cache age (still conditional, so usually a cheap 304)"""
+        cache_key = endpoint if endpoint else "root"
+        return await asyncio.shield(self.start_fetch(endpoint, cache_key))
+
+    def start_fetch(self, endpoint: str, cache_key: str) -> asyncio.Task:
+        """Return the in-flight fetch for a cache key, starting one if needed"""
+        fetch_task = self.inflight_fetches.get(cache_key)
+        if fetch_task is None:
+            fetch_task = asyncio.ensure_future(self.fetch_from_endpoints(endpoint, cache_key))
+            self.inflight_fetches[cache_key] = fetch_task
+            fetch_task.add_done_callback(lambda _: self.inflight_fetches.pop(cache_key, None))
+        return fetch_task
+
+    def get_endpoint_order(self, endpoint: str = "") -> List[int]:
+        """Order endpoints by expected latency, penalising unreliable ones; the raw endpoint is always last"""
+        candidates = range(len(self.api_endpoints))
+        if endpoint:
+            # The raw endpoint only serves the full worldstate
+            candidates = [i for i in candidates if self.api_endpoints[i]["type"] == "parsed"]
+        # Raw data has no arbitration, Steel Path, Zariman or Duviri sections, so it is only a fallback
+        return sorted(
+            candidates,
+            key=lambda i: (self.api_endpoints[i]["type"] != "parsed", self.endpoint_stats[i].score(), i)
+        )
 
-        # Try each API endpoint in order
-        for api_index in range(len(self.api_endpoints)):
-            api_config = self.api_endpoints[api_index]
-        
-            if api_config["type"] == "parsed":
-                url = f"{api_config['base']}/{endpoint}" if endpoint else api_config['base']
-            else:
-                url = api_config['base']
-        
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                        
-                            # Success! Update tracking
-                            self.cache[cache_key] = data
-                            self.last_fetch[cache_key] = datetime.now()
-                            self.last_successful_api = api_index
-                            self.api_failure_count[api_index] = 0
-                            api_config["status"] = "working"
-                        
-                            logging.info(f"✅ Successfully fetched data from {api_config['name']}")
-                            return data
-                        else:
-                            logging.warning(f"❌ {api_config['name']} returned status {response.status}")
-                            api_config["status"] = f"error_{response.status}"
-                        
-            except Exception as e:
-                logging.error(f"❌ {api_config['name']} failed: {e}")
-                api_config["status"] = "failed"
-                self.api_failure_count[api_index] += 1
+    async def fetch_from_endpoints(self, endpoint: str, cache_key: str) -> Optional[Dict]:
+        """Fetch with hedging: start a backup request if the current one is slower than its p95"""
+        bot_metrics.increment("worldstate.network_fetches")
+
+        # Never make a user wait on an endpoint that is known to be down
+        order = [i for i in self.get_endpoint_order(endpoint) if self.circuit_breakers[i].allows_requests()]
+        if not order:
+            logging.error("❌ All Warframe API circuits are open, skipping fetch")
+            self.last_successful_api = None
+            return None
+        next_position = 0
+        pending = set()
+        task_endpoints = {}
+        # Endpoints launched as hedges, as opposed to the first request or a failover after everything failed
+        hedged_indices = set()
+
+        def launch_next():
+            nonlocal next_position
+            api_index = order[next_position]
+            next_position += 1
+            task = asyncio.ensure_future(self.fetch_from_endpoint(api_index, endpoint, cache_key))
+            task_endpoints[task] = api_index
+            pending.add(task)
+            return api_index
+
+        latest_index = launch_next()
+        try:
+            while pending:
+                # Only hedge while there is another endpoint left to try
+                hedge_delay = None
+                if next_position < len(order):
+                    hedge_delay = self.endpoint_stats[latest_index].p95()
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    latest_index = launch_next()
+                    hedged_indices.add(latest_index)
+                    bot_metrics.increment("worldstate.hedged_requests")
+                    logging.info(f"⏱️ Hedging worldstate fetch to {self.api_endpoints[latest_index]['name']}")
+                    continue
+
+                for task in done:
+                    result = task.result()
+                    if result is not None:
+                        data, validators = result
+                        api_index = task_endpoints[task]
+                        self.cache[cache_key] = data
+                        self.cache_validators[cache_key] = validators
+                        self.last_fetch[cache_key] = datetime.now()
+                        self.last_successful_api = api_index
+                        # Only a win if the backup request beat the one it was hedging
+                        if api_index in hedged_indices:
+                            bot_metrics.increment("worldstate.hedged_wins")
+                        return data
+
+                # Everything in flight failed, move straight on to the next endpoint
+                if not pending and next_position < len(order):
+                    latest_index = launch_next()
+        finally:
+            for task in pending:
+                task.cancel()
 
         # All APIs failed
         logging.error("❌ All Warframe APIs failed to respond")
         self.last_successful_api = None
         return None
-   
-    async def get_cycles(self) -> Dict:
-        """Get all cycle information"""
-        data = await self.fetch_data()
-        if not data:
-            return {}
-            
-        return {
-            "cetus": data.get("cetusCycle", {}),
-            "fortuna": data.get("vallisCycle", {}),
-            "deimos": data.get("cambionCycle", {}),
-            "zariman": data.get("zarimanCycle", {}),
-            "duviri": data.get("duviriCycle", {})
-        }
-    
-    async def get_fissures(self, include_storms: bool = True) -> List[Dict]:
-        """Get void fissure missions"""
-        data = await self.fetch_data()
-        if not data:
-            return []
-            
-        fissures = data.get("fissures", [])
+
+    async def fetch_from_endpoint(self, api_index: int, endpoint: str, cache_key: str = None) -> Optional[tuple]:
+        """Fetch from a single API endpoint, recording its latency and outcome
         
-        if not include_storms:
-            fissures = [f for f in fissures if not f.get("isStorm", False)]
-            
-        return fissures
-    
-    async def get_fissures_by_type(self) -> Dict[str, List[Dict]]:
-        """Get fissures organized by type (normal, steel path, railjack)"""
+        Returns (data, validators) on success, or None on failure.
+        """
+        api_config = self.api_endpoints[api_index]
+        stats = self.endpoint_stats[api_index]
+
+        if api_config["type"] == "parsed":
+            url = f"{api_config['base']}/{endpoint}" if endpoint else api_config['base']
+        else:
+            url = api_config['base']
+
+        # Validators only apply to the endpoint that produced the cached copy
+        headers = {}
+        validators = self.cache_validators.get(cache_key, {})
+        cache_is_from_endpoint = cache_key in self.cache and validators.get("api_index") == api_index
+        if cache_is_from_endpoint:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        started = time.monotonic()
+        try:
+            session = await self.http_client.get_session()
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                if response.status == 304 and cache_is_from_endpoint:
+                    # Nothing changed, skip the download and the parse
+                    data = self.cache[cache_key]
+                    new_validators = validators
+                    bot_metrics.increment("worldstate.not_modified")
+                elif response.status == 200:
+                    data = await response.json(content_type=None)
+                    if api_config["type"] == "raw":
+                        data = self.raw_normalizer.normalize(data)
+                    new_validators = {
+                        "api_index": api_index,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }
+                else:
+                    data = None
+
+                if data is not None:
+                    # Success! Update tracking
+                    stats.record_success(time.monotonic() - started)
+                    self.api_failure_count[api_index] = 0
+                    api_config["status"] = "working"
+                    self.log_circuit_transition(api_index, self.circuit_breakers[api_index].record_success())
+
+                    logging.info(f"✅ Successfully fetched data from {api_config['name']} (status {response.status})")
+                    return data, new_validators
+                else:
+                    stats.record_failure(time.monotonic() - started)
+                    logging.warning(f"❌ {api_config['name']} returned status {response.status}")
+                    api_config["status"] = f"error_{response.status}"
+                    self.api_failure_count[api_index] += 1
+
+        except asyncio.CancelledError:
+            # Lost a hedge race, which says nothing about the endpoint's health
+            raise
+        except Exception as e:
+            stats.record_failure(time.monotonic() - started)
+            logging.error(f"❌ {api_config['name']} failed: {e}")
+            api_config["status"] = "failed"
+            self.api_failure_count[api_index] += 1
+
+        breaker = self.circuit_breakers[api_index]
+        self.log_circuit_transition(api_index, breaker.record_failure(self.api_failure_count[api_index]))
+        return None
+
+    def log_circuit_transition(self, api_index: int, old_state: Optional[str]):
+        """Record a circuit breaker state change, if there was one"""
+        if old_state is None:
+            return
+        breaker = self.circuit_breakers[api_index]
+        name = self.api_endpoints[api_index]["name"]
+        self.circuit_transitions.append((datetime.now(), name, old_state, breaker.state))
+        bot_metrics.increment(f"worldstate.circuit_{breaker.state}")
+        logging.warning(f"🔌 Circuit for {name}: {old_state} -> {breaker.state}")
+
+    async def probe_open_circuits(self):
+        """Test open circuits off the request path and close them if they recover"""
+        for api_index, breaker in self.circuit_breakers.items():
+            if not breaker.ready_for_probe():
+                continue
+            self.log_circuit_transition(api_index, breaker.transition(CircuitBreaker.HALF_OPEN))
+            bot_metrics.increment("worldstate.circuit_probes")
+            await self.fetch_from_endpoint(api_index, "")
+   
+    async def get_snapshot(self) -> Optional[WorldstateSnapshot]:
+        """Get the current worldstate snapshot, rebuilding it only when new data arrived"""
         data = await self.fetch_data()
         if not data:
-            return {"normal": [], "steel_path": [], "railjack": []}
-        
-        fissures = data.get("fissures", [])
-        
-        categorized = {
-            "normal": [],
-            "steel_path": [],
-            "railjack": []
-        }
-        
-        for fissure in fissures:
-            if fissure.get("isStorm", False):
-                categorized["railjack"].append(fissure)
-            elif fissure.get("isHard", False):
-                categorized["steel_path"].append(fissure)
-            else:
-                categorized["normal"].append(fissure)
+            return None
+
+        # Cache hits and 304s hand back the same payload object, so no re-parse
+        if data is not self.snapshot_source:
+            self.snapshot = build_worldstate_snapshot(data, self.snapshot_version + 1)
+            self.snapshot_version = self.snapshot.version
+            self.snapshot_source = data
+            bot_metrics.set_gauge("worldstate.snapshot_version", self.snapshot_version)
+            self.cycle_engine.reanchor(self.snapshot.cycles, self.snapshot.fetched_at)
+        return self.snapshot
+   
+    async def get_cycles(self) -> Dict[str, Cycle]:
+        """Get all cycle information (computed locally, no network)"""
+        return self.cycle_engine.cycles_at()
+    
+    async def get_fissures(self, include_storms: bool = True) -> tuple:
+        """Get void fissure missions"""
+        snapshot = await self.get_snapshot()
+        if not snapshot:
+            return ()
         
-        return categorized
+        if not include_storms:
+            return snapshot.fissures_by_type["normal"] + snapshot.fissures_by_type["steel_path"]
+        return snapshot.fissures
+    
+    async def get_fissures_by_type(self) -> Dict[str, tuple]:
+        """Get fissures organized by type (normal, steel path, railjack)"""
+        snapshot = await self.get_snapshot()
+        if not snapshot:
+            return {kind: () for kind in FISSURE_KINDS}
+        return snapshot.fissures_by_type
     
-    async def get_steel_path_info(self) -> Dict:
+    async def get_steel_path_info(self) -> Optional[SteelPath]:
         """Get Steel Path incursions and rewards"""
-        data = await self.fetch_data()
-        if not data:
-            return {}
-            
-        steel_path = data.get("steelPath", {})
-        return steel_path
+        snapshot = await self.get_snapshot()
+        return snapshot.steel_path if snapshot else None
     
-    async def get_arbitration(self) -> Dict:
+    async def get_arbitration(self) -> Optional[Arbitration]:
         """Get current arbitration mission"""
-        data = await self.fetch_data()
-        if not data:
-            return {}
-        return data.get("arbitration", {})
+        snapshot = await self.get_snapshot()
+        return snapshot.arbitration if snapshot else None
     
-    async def get_sortie(self) -> Dict:
+    async def get_sortie(self) -> Optional[Sortie]:
         """Get current sortie missions"""
-        data = await self.fetch_data()
-        if not data:
-            return {}
-        return data.get("sortie", {})
+        snapshot = await self.get_snapshot()
+        return snapshot.sortie if snapshot else None
+    
+    async def get_void_trader(self) -> Optional[VoidTrader]:
+        """Get Baro Ki'Teer's current or next visit"""
+        snapshot = await self.get_snapshot()
+        return snapshot.void_trader if snapshot else None
 
 class SubscriptionManager:
-    """Manages user subscriptions for different events"""
+    """Manages user subscriptions for different events, stored in SQLite with an in-memory index"""
     
-    def __init__(self, bot):
+    def __init__(self, bot, db_path: str = SUBSCRIPTIONS_DB_FILE):
         self.bot = bot
+        # Pre-SQLite files, imported once
         self.subscriptions_file = "warframe_subscriptions.json"
+        self.preferences_file = "warframe_notification_prefs.json"
+        # Imported subscriptions whose filters could not be kept without widening them
+        self.rejects_file = "warframe_subscription_rejects.json"
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.executescript(SUBSCRIPTIONS_DB_SCHEMA)
+        # One thread so writes stay in order without holding up the event loop
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="subscriptions-db")
+        self.import_json()
         self.subscriptions = self.load_subscriptions()
-        
-    def load_subscriptions(self) -> Dict:
-        """Load subscriptions from file"""
+        self.preferences = self.load_preferences()
+        # (event type, lead minutes) -> compiled filter mask -> user ids
+        self.index = {}
+        self.rebuild_index()
+
+    def write(self, sql: str, params: tuple = ()):
+        """Queue a write on the database thread; callers don't wait for it"""
+        def run():
+            with self.db:
+                self.db.execute(sql, params)
+        future = self.writer.submit(run)
+        future.add_done_callback(self.log_write_error)
+        bot_metrics.increment("subscriptions.db_writes")
+
+    @staticmethod
+    def log_write_error(future):
+        if future.exception():
+            bot_metrics.increment("subscriptions.db_write_errors")
+            logging.error(f"Error writing subscriptions database: {future.exception()}")
+
+    async def close(self):
+        """Finish queued writes and close the database"""
+        await asyncio.get_running_loop().run_in_executor(self.writer, self.db.close)
+        self.writer.shutdown(wait=False)
+
+    def import_json(self):
+        """One-shot import of the old JSON files into an empty database; the files are renamed afterwards"""
+        if self.db.execute("SELECT 1 FROM subscriptions LIMIT 1").fetchone():
+            return
         try:
+            subscriptions, preferences = {}, {}
             if os.path.exists(self.subscriptions_file):
                 with open(self.subscriptions_file, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            logging.error(f"Error loading subscriptions: {e}")
-        return {}
-    
-    def save_subscriptions(self):
-        """Save subscriptions to file"""
-        try:
-            with open(self.subscriptions_file, 'w') as f:
-                json.dump(self.subscriptions, f, indent=2)
+                    subscriptions = json.load(f)
+            if os.path.exists(self.preferences_file):
+                with open(self.preferences_file, 'r') as f:
+                    preferences = json.load(f)
+            if not subscriptions and not preferences:
+                return
+
+            rows, rejects = [], {}
+            for user_id_str, user_subs in subscriptions.items():
+                for event_type, subs in user_subs.items():
+                    for sub in subs:
+                        details, mask = sub.get("details", ""), sub.get("mask")
+                        if mask is None:
+                            # A bad filter must never widen a subscription, so skip it rather than match everything
+                            filters = salvage_filter_details(details)
+                            if filters is None:
+                                logging.warning(f"Rejected {event_type} subscription of user {user_id_str}: "
+                                                f"no usable filter in '{details}'")
+                                rejects.setdefault(user_id_str, {}).setdefault(event_type, []).append(sub)
+                                continue
+                            details, mask = self.compile_filters(event_type, filters)
+                        rows.append((int(user_id_str), event_type, details, mask, sub.get("lead", 0), sub.get("added")))
+            with self.db:
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO subscriptions (user_id, event_type, details, mask, lead, added) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO preferences (user_id, delivery) VALUES (?, ?)",
+                    [(int(user_id_str), prefs["delivery"]) for user_id_str, prefs in preferences.items()
+                     if prefs.get("delivery")]
+                )
+            if rejects:
+                with open(self.rejects_file, 'w') as f:
+                    json.dump(rejects, f, indent=2)
+                logging.warning(f"Kept {sum(len(subs) for user_subs in rejects.values() for subs in user_subs.values())} "
+                                f"unusable subscriptions in {self.rejects_file}")
+            for path in (self.subscriptions_file, self.preferences_file):
+                if os.path.exists(path):
+                    os.replace(path, f"{path}.imported")
+            logging.info(f"Imported {len(rows)} subscriptions and {len(preferences)} preferences into SQLite")
         except Exception as e:
-            logging.error(f"Error saving subscriptions: {e}")
-            
-    def get_all_fissure_subscribers(self) -> Dict[int, str]:
-        """Get all users subscribed to fissure missions with their filter details"""
-        subscribers = {}
+            logging.error(f"Error importing subscriptions from JSON: {e}")
+        
+    def load_subscriptions(self) -> Dict:
+        """Load subscriptions from the database into {user id: {event type: [subscription]}}"""
+        subscriptions = {}
+        for user_id, event_type, details, mask, lead, added in self.db.execute(
+            "SELECT user_id, event_type, details, mask, lead, added FROM subscriptions ORDER BY rowid"
+        ):
+            sub = {"details": details, "mask": mask, "added": added}
+            if lead:
+                sub["lead"] = lead
+            subscriptions.setdefault(str(user_id), {}).setdefault(event_type, []).append(sub)
+        return subscriptions
+
+    @staticmethod
+    def compile_details(event_type: str, event_details: str) -> tuple:
+        """Canonical details string and filter mask for a subscription"""
+        return SubscriptionManager.compile_filters(event_type, parse_filter_details(event_details))
+
+    @staticmethod
+    def compile_filters(event_type: str, filters: Dict[str, tuple]) -> tuple:
+        details = format_filter_details(filters)
+        if event_type in FISSURE_EVENT_FILTERS:
+            # The event's own filters win, e.g. steel_path_fissures is always kind:steel_path
+            merged = dict(filters)
+            merged.update(FISSURE_EVENT_FILTERS[event_type])
+            return details, compile_filter_mask(merged)
+        return details, FILTER_ALL_MASK
+
+    def rebuild_index(self):
+        """Build the subscription index from the stored subscriptions"""
+        self.index = {}
         for user_id_str, user_subs in self.subscriptions.items():
-            if "fissure_missions" in user_subs:
-                for sub in user_subs["fissure_missions"]:
-                    subscribers[int(user_id_str)] = sub.get("details", "")
-                    break  # Take the first/most recent subscription
-        return subscribers
+            for event_type, subs in user_subs.items():
+                for sub in subs:
+                    self.index_subscription(int(user_id_str), event_type, sub["mask"], sub.get("lead", 0))
+
+    def index_subscription(self, user_id: int, event_type: str, mask: int, lead: int = 0):
+        self.index.setdefault((event_type, lead), {}).setdefault(mask, set()).add(user_id)
+
+    def unindex_subscription(self, user_id: int, event_type: str, mask: int, lead: int = 0):
+        masks = self.index.get((event_type, lead), {})
+        users = masks.get(mask)
+        if users is not None:
+            users.discard(user_id)
+            if not users:
+                del masks[mask]
+                if not masks:
+                    del self.index[(event_type, lead)]
+
+    def lead_times(self, event_type: str) -> List[int]:
+        """Distinct reminder lead times (minutes) that someone subscribed to for an event"""
+        return sorted(lead for event, lead in self.index if event == event_type and lead)
+
+    def get_recipients(self, event_types: Sequence[str], subject_mask: int = 0, lead: int = 0) -> set:
+        """Every user with a subscription to one of these events whose filters match the subject"""
+        # Users share filters, so this walks distinct filters rather than users; a subject mask of 0 matches all
+        recipients = set()
+        for event_type in event_types:
+            for mask, users in self.index.get((event_type, lead), {}).items():
+                if mask & subject_mask == subject_mask:
+                    recipients |= users
+        return recipients
+
+    def get_fissure_recipients(self, fissure: Fissure) -> set:
+        """Every user with at least one subscription matching this fissure"""
+        return self.get_recipients(FISSURE_EVENT_FILTERS, fissure.filter_mask)
    
-    def add_subscription(self, user_id: int, event_type: str, event_details: str = "") -> bool:
-        """Add a subscription for a user"""
+    def add_subscription(self, user_id: int, event_type: str, event_details: str = "", lead: int = 0) -> bool:
+        """Add a subscription for a user, optionally lead minutes early; raises ValueError for unknown filter values"""
         user_id_str = str(user_id)
+        details, mask = self.compile_details(event_type, event_details)
         
         if user_id_str not in self.subscriptions:
             self.subscriptions[user_id_str] = {}
@@ -478,20 +2179,27 @@ class SubscriptionManager:
         if event_type not in self.subscriptions[user_id_str]:
             self.subscriptions[user_id_str][event_type] = []
             
-        subscription = {"details": event_details, "added": datetime.now().isoformat()}
+        subscription = {"details": details, "mask": mask, "added": datetime.now().isoformat()}
+        if lead:
+            subscription["lead"] = lead
         
         # Check if already subscribed
         for sub in self.subscriptions[user_id_str][event_type]:
-            if sub.get("details") == event_details:
+            if sub.get("mask") == mask and sub.get("lead", 0) == lead:
                 return False  # Already subscribed
                 
         self.subscriptions[user_id_str][event_type].append(subscription)
-        self.save_subscriptions()
+        self.index_subscription(user_id, event_type, mask, lead)
+        self.write(
+            "INSERT OR IGNORE INTO subscriptions (user_id, event_type, details, mask, lead, added) VALUES (?, ?, ?, ?, ?, ?)",
+            (user_id, event_type, details, mask, lead, subscription["added"])
+        )
         return True
     
-    def remove_subscription(self, user_id: int, event_type: str, event_details: str = "") -> bool:
+    def remove_subscription(self, user_id: int, event_type: str, event_details: str = "", lead: int = 0) -> bool:
         """Remove a subscription for a user"""
         user_id_str = str(user_id)
+        _, mask = self.compile_details(event_type, event_details)
 
         # If user has never subscribed, nothing to remove
         if user_id_str not in self.subscriptions:
@@ -503,55 +2211,177 @@ class SubscriptionManager:
             return False
 
         original_count = len(user_subs[event_type])
-        # Filter out matching details
+        # Filter out matching filters
         user_subs[event_type] = [
             sub for sub in user_subs[event_type]
-            if sub.get("details") != event_details
+            if sub.get("mask") != mask or sub.get("lead", 0) != lead
         ]
 
+        removed = len(user_subs[event_type]) < original_count
+        if removed:
+            self.unindex_subscription(user_id, event_type, mask, lead)
+            self.write(
+                "DELETE FROM subscriptions WHERE user_id = ? AND event_type = ? AND mask = ? AND lead = ?",
+                (user_id, event_type, mask, lead)
+            )
+
         # Clean up if now empty
         if not user_subs[event_type]:
             del user_subs[event_type]
         if not user_subs:
             del self.subscriptions[user_id_str]
 
-        self.save_subscriptions()
         # Return True if we removed at least one entry
-        new_count = len(self.subscriptions.get(user_id_str, {}).get(event_type, []))
-        return new_count < original_count
+        return removed
 
     
     def get_subscribers(self, event_type: str, event_details: str = "") -> List[int]:
         """Get all users subscribed to a specific event"""
-        subscribers = []
-        
-        for user_id_str, user_subs in self.subscriptions.items():
-            if event_type in user_subs:
-                for sub in user_subs[event_type]:
-                    if sub.get("details") == event_details:
-                        subscribers.append(int(user_id_str))
-                        break
-                        
-        return subscribers
+        _, mask = self.compile_details(event_type, event_details)
+        return list(self.index.get((event_type, 0), {}).get(mask, ()))
     
     def get_user_subscriptions(self, user_id: int) -> Dict:
         """Get all subscriptions for a specific user"""
         user_id_str = str(user_id)
         return self.subscriptions.get(user_id_str, {})
+
+    def load_preferences(self) -> Dict:
+        """Load per-user notification preferences from the database"""
+        return {
+            str(user_id): {"delivery": delivery}
+            for user_id, delivery in self.db.execute("SELECT user_id, delivery FROM preferences")
+        }
+
+    def get_delivery_mode(self, user_id: int) -> str:
+        """'digest' (default) or 'immediate'"""
+        return self.preferences.get(str(user_id), {}).get("delivery", "digest")
+
+    def set_delivery_mode(self, user_id: int, mode: str):
+        self.preferences.setdefault(str(user_id), {})["delivery"] = mode
+        self.write("INSERT OR REPLACE INTO preferences (user_id, delivery) VALUES (?, ?)", (user_id, mode))
         
 
+class RoleBroadcastManager:
+    """Per-guild role pings that replace individual DMs for an event"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.broadcasts_file = "warframe_role_broadcasts.json"
+        # guild id -> [{"event", "details", "mask", "role_id", "channel_id"}]
+        self.broadcasts = self.load_broadcasts()
+        # event type -> compiled filter mask -> [(channel id, role id)]
+        self.index = {}
+        self.rebuild_index()
+
+    def load_broadcasts(self) -> Dict:
+        """Load role broadcasts from file"""
+        try:
+            if os.path.exists(self.broadcasts_file):
+                with open(self.broadcasts_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logging.error(f"Error loading role broadcasts: {e}")
+        return {}
+
+    def save_broadcasts(self):
+        """Save role broadcasts to file"""
+        try:
+            with open(self.broadcasts_file, 'w') as f:
+                json.dump(self.broadcasts, f, indent=2)
+        except Exception as e:
+            logging.error(f"Error saving role broadcasts: {e}")
+
+    def rebuild_index(self):
+        self.index = {}
+        for guild_broadcasts in self.broadcasts.values():
+            for broadcast in guild_broadcasts:
+                self.index.setdefault(broadcast["event"], {}).setdefault(broadcast["mask"], []).append(
+                    (broadcast["channel_id"], broadcast["role_id"])
+                )
+
+    def set_broadcast(self, guild_id: int, event_type: str, event_details: str, role_id: int, channel_id: int):
+        """Map an event (with filters) to a role and channel, replacing an earlier mapping of the same filters"""
+        details, mask = SubscriptionManager.compile_details(event_type, event_details)
+        guild_broadcasts = self.broadcasts.setdefault(str(guild_id), [])
+        guild_broadcasts[:] = [
+            broadcast for broadcast in guild_broadcasts
+            if (broadcast["event"], broadcast["mask"]) != (event_type, mask)
+        ]
+        guild_broadcasts.append({
+            "event": event_type, "details": details, "mask": mask, "role_id": role_id, "channel_id": channel_id,
+        })
+        self.save_broadcasts()
+        self.rebuild_index()
+
+    def remove_broadcast(self, guild_id: int, event_type: str, event_details: str) -> bool:
+        _, mask = SubscriptionManager.compile_details(event_type, event_details)
+        guild_broadcasts = self.broadcasts.get(str(guild_id), [])
+        remaining = [
+            broadcast for broadcast in guild_broadcasts
+            if (broadcast["event"], broadcast["mask"]) != (event_type, mask)
+        ]
+        if len(remaining) == len(guild_broadcasts):
+            return False
+        if remaining:
+            self.broadcasts[str(guild_id)] = remaining
+        else:
+            del self.broadcasts[str(guild_id)]
+        self.save_broadcasts()
+        self.rebuild_index()
+        return True
+
+    def get_guild_broadcasts(self, guild_id: int) -> List[dict]:
+        return self.broadcasts.get(str(guild_id), [])
+
+    def get_targets(self, event_types: Sequence[str], subject_mask: int = 0) -> set:
+        """(channel id, role id) for every broadcast whose filters match, same matching as subscriptions"""
+        targets = set()
+        for event_type in event_types:
+            for mask, mask_targets in self.index.get(event_type, {}).items():
+                if mask & subject_mask == subject_mask:
+                    targets.update(mask_targets)
+        return targets
+
+
 class EmbedGenerator:
     """Enhanced embed generator with improved visuals and Discord timestamps"""
 
+    def __init__(self):
+        # (panel, data version, API status) -> Embed, least recently used first
+        self.render_cache = OrderedDict()
+
+    def render(self, panel: str, version, api_status: Optional[dict], build) -> Embed:
+        """Build an embed once per data version and API status; the result is shared, so treat it as read-only"""
+        key = (panel, version, api_status["message"] if api_status else None)
+        embed = self.render_cache.get(key)
+        if embed is not None:
+            self.render_cache.move_to_end(key)
+            bot_metrics.increment("render.hits")
+            return embed
+
+        bot_metrics.increment("render.misses")
+        embed = build()
+        self.render_cache[key] = embed
+        if len(self.render_cache) > RENDER_CACHE_SIZE:
+            self.render_cache.popitem(last=False)
+        return embed
+
+    def cycles_panel(self, cycles_data: Dict[str, Cycle], api_status: dict = None) -> Embed:
+        # Cycles are computed locally, so their own (immutable) records are the version
+        return self.render("cycles", tuple(cycles_data.values()), api_status,
+                           lambda: self.create_cycles_embed(cycles_data, api_status))
+
+    def fissures_panel(self, snapshot: Optional[WorldstateSnapshot], fissure_type: str, api_status: dict = None) -> Embed:
+        fissures = snapshot.fissures_by_type[fissure_type] if snapshot else ()
+        return self.render(f"fissures.{fissure_type}", snapshot.version if snapshot else None, api_status,
+                           lambda: self.create_fissures_embed(fissures, fissure_type, api_status))
+
     @staticmethod
-    def create_cycles_embed(cycles_data: Dict, api_status: dict = None) -> Embed:
+    def create_cycles_embed(cycles_data: Dict[str, Cycle], api_status: dict = None) -> Embed:
         """Create enhanced embed for cycle information with Discord timestamps and API status footer"""
         embed = Embed(title="🌍 Warframe Open World Cycles", color=0x4CAF50)
         embed.timestamp = datetime.utcnow()
 
-        # Debug log the entire cycles data
-        logging.info(f"DEBUG: Full cycles_data: {cycles_data}")
-
         for location, cycle in cycles_data.items():
             if not cycle:
                 continue
@@ -566,17 +2396,7 @@ class EmbedGenerator:
             elif location == "zariman":
                 location_name = "Zariman Ten Zero"
 
-            state = cycle.get("state", "Unknown")
-            # NEW: Enhanced time_left extraction that handles missing timeLeft
-            time_left = cycle.get("timeLeft")
-            if not time_left and cycle.get("expiry"):
-                time_left = calculate_eta_from_expiry(cycle.get("expiry"))
-            else:
-                time_left = time_left or "Unknown"
-
-        
-            # Debug log each cycle's data
-            logging.info(f"DEBUG: {location} cycle - state: '{state}', timeLeft: '{time_left}'")
+            state = cycle.state or "Unknown"
 
             # Get appropriate icon based on location and state
             if location in CYCLE_LOCATION_ICONS:
@@ -587,13 +2407,8 @@ class EmbedGenerator:
             else:
                 icon = "🔸"
 
-            # Convert time to Discord timestamp with fallback
-            discord_time = parse_warframe_time_to_discord_timestamp(time_left)
-        
-            # Fallback to raw time if parsing failed
-            if discord_time == "Unknown" and time_left != "Unknown":
-                discord_time = f"in {time_left}"
-                logging.info(f"DEBUG: Using raw time fallback for {location}: {discord_time}")
+            # Expiry is precomputed, so this is just formatting
+            discord_time = format_discord_timestamp(cycle.expiry)
 
             field_name = f"{icon} {location_name}"
             field_value = f"**{state.title()}**\nEnds {discord_time}"
@@ -613,8 +2428,16 @@ class EmbedGenerator:
 
         return embed
 
+    def create_channel_embeds(self, cycles_data: Dict[str, Cycle], snapshot: Optional[WorldstateSnapshot],
+                              api_status: dict = None) -> Dict:
+        """Render every auto-updating channel panel once, to be shared by all guilds"""
+        return {
+            "cycles": self.cycles_panel(cycles_data, api_status),
+            "fissures": {kind: self.fissures_panel(snapshot, kind, api_status) for kind in FISSURE_KINDS},
+        }
+
     @staticmethod
-    def create_fissures_embed(fissures: List[Dict], fissure_type: str, api_status: dict = None) -> Embed:
+    def create_fissures_embed(fissures: Sequence[Fissure], fissure_type: str, api_status: dict = None) -> Embed:
         """Create enhanced embed for specific fissure type with API status footer"""
         # Configure embed based on fissure type
         if fissure_type == "normal":
@@ -649,9 +2472,8 @@ class EmbedGenerator:
         # Group by tier
         tiers = {"Lith": [], "Meso": [], "Neo": [], "Axi": [], "Requiem": [], "Omnia": []}
         for fissure in fissures:
-            tier = fissure.get("tier", "Unknown")
-            if tier in tiers:
-                tiers[tier].append(fissure)
+            if fissure.tier in tiers:
+                tiers[fissure.tier].append(fissure)
 
         for tier, tier_fissures in tiers.items():
             if not tier_fissures:
@@ -660,21 +2482,12 @@ class EmbedGenerator:
             tier_icon = get_relic_tier_icon(tier)
             fissure_list = []
             for fissure in tier_fissures[:5]:  # Limit to 5 per tier
-                node = fissure.get("node", "Unknown")
-                mission_type = fissure.get("missionType", "Unknown")
-                enemy = fissure.get("enemy", "Unknown")
-            
-                # NEW: Calculate ETA from expiry timestamp
-                eta = calculate_eta_from_expiry(fissure.get("expiry"))
-            
-                # Debug log each fissure's ETA
-                logging.info(f"DEBUG: Fissure {node} calculated ETA: '{eta}'")
-            
-                # Convert ETA to Discord timestamp
-                if eta and eta != "Unknown":
-                    discord_time = f"<t:{int(datetime.fromisoformat(fissure.get('expiry').replace('Z', '+00:00')).timestamp())}:R>"
-                else:
-                    discord_time = "Unknown"
+                node = fissure.node
+                mission_type = fissure.mission_type
+                enemy = fissure.enemy
+
+                # Expiry is already an epoch, so no per-render timestamp parsing
+                discord_time = format_discord_timestamp(fissure.expiry)
             
                 # Get enemy faction icon
                 enemy_icon = get_enemy_faction_icon(enemy)
@@ -698,158 +2511,585 @@ class EmbedGenerator:
 
         return embed
 
-class NotificationManager:
-    """Handles sending notifications to subscribed users"""
+    @staticmethod
+    def create_steel_path_embed(steel_path_data: SteelPath) -> Embed:
+        """Steel Path reward and rotation"""
+        embed = discord.Embed(title="🔥 Steel Path", color=0xE91E63)
+        embed.timestamp = datetime.utcnow()
     
-    def __init__(self, bot, subscription_manager: SubscriptionManager):
-        self.bot = bot
-        self.subscription_manager = subscription_manager
-        self.last_notifications = {}
+        # Current reward
+        if steel_path_data.reward_name:
+            embed.add_field(
+                name="🎁 Current Reward",
+                value=f"**{steel_path_data.reward_name}**\n💎 {steel_path_data.reward_cost} Steel Essence",
+                inline=True
+            )
+    
+        # Time remaining
+        embed.add_field(
+            name="⏰ Time Remaining",
+            value=f"Ends {format_discord_timestamp(steel_path_data.expiry)}",
+            inline=True
+        )
+        return embed
+
+    @staticmethod
+    def create_arbitration_embed(arbitration_data: Optional[Arbitration]) -> Embed:
+        """Current arbitration, or a note that there is none"""
+        embed = discord.Embed(title="⚖️ Arbitration", color=0x9C27B0)
+        embed.timestamp = datetime.utcnow()
+    
+        if not arbitration_data:
+            embed.description = "No active arbitration mission"
+        else:
+            embed.add_field(
+                name="🎯 Current Mission",
+                value=f"**{arbitration_data.mission_type}** - {arbitration_data.node}\n🏴 {arbitration_data.enemy}",
+                inline=True
+            )
         
-    async def check_cycle_changes(self, cycles_data: Dict):
-        """Enhanced cycle change detection with initial state notifications"""
-        for location, cycle in cycles_data.items():
-            if not cycle:
-                continue
+            embed.add_field(
+                name="⏰ Time Remaining",
+                value=f"Ends {format_discord_timestamp(arbitration_data.expiry)}",
+                inline=True
+            )
+        return embed
 
-            state = cycle.get("state", "")
-            cycle_id = cycle.get("id", "")
-        
-            # Create a unique key for this cycle state
-            state_key = f"{location}_{state}"
-        
-            # Check if this is a new cycle OR if we haven't notified about this state yet
-            is_new_cycle = (location not in self.last_notifications or 
-                        self.last_notifications[location] != cycle_id)
-        
-            # Track if we've already sent notifications for this specific state
-            notification_key = f"notified_{state_key}"
-            already_notified_this_state = self.last_notifications.get(notification_key, False)
-        
-            if is_new_cycle:
-                # Update our tracking
-                self.last_notifications[location] = cycle_id
-                # Reset notification flags for this location
-                for key in list(self.last_notifications.keys()):
-                    if key.startswith(f"notified_{location}_"):
-                        del self.last_notifications[key]
-        
-            # Send notifications for important states (even if not a "new" cycle)
-            should_notify = False
-            notification_title = ""
-            notification_message = ""
-        
-            if location == "cetus" and state == "night" and not already_notified_this_state:
-                should_notify = True
-                notification_title = "Cetus Night"
-                notification_message = (
-                    f"🌙 **Night has fallen on Cetus!**\n"
-                    f"Time for Eidolon hunting!\n"
-                    f"⏰ {cycle.get('timeLeft', 'Unknown')} remaining"
-                )
-            
-            elif location == "fortuna" and state == "warm" and not already_notified_this_state:
-                should_notify = True
-                notification_title = "Fortuna Warm"
-                notification_message = (
-                    f"🔥 **Orb Vallis is now warm!**\n"
-                    f"Perfect for resource farming!\n"
-                    f"⏰ {cycle.get('timeLeft', 'Unknown')} remaining"
-                )
+    @staticmethod
+    def create_sortie_embed(sortie_data: Sortie) -> Embed:
+        """Today's sortie with its missions"""
+        embed = discord.Embed(title="🎯 Daily Sortie", color=0xFF5722)
+        embed.timestamp = datetime.utcnow()
+    
+        embed.add_field(name="Boss", value=sortie_data.boss, inline=True)
+        embed.add_field(name="Faction", value=sortie_data.faction, inline=True)
+        embed.add_field(name="Time Remaining", value=f"Ends {format_discord_timestamp(sortie_data.expiry)}", inline=True)
+    
+        variants = sortie_data.variants
+        if variants:
+            mission_list = []
+            for i, variant in enumerate(variants[:3], 1):
+                mission_list.append(f"**{i}.** {variant.mission_type} - {variant.node}\n*{variant.modifier}*")
         
-            if should_notify:
-                # Send the notification
-                event_type = f"{location}_{'night' if state == 'night' else 'warm'}"
-                await self.notify_subscribers(event_type, notification_title, notification_message)
-            
-                # Mark that we've notified about this state
-                self.last_notifications[notification_key] = True
-            
-                logging.info(f"Sent {event_type} notification - State: {state}, Time left: {cycle.get('timeLeft', 'Unknown')}")
+            embed.add_field(
+                name="Missions",
+                value="\n\n".join(mission_list),
+                inline=False
+            )
+        return embed
 
+    @staticmethod
+    def create_baro_embed(void_trader: VoidTrader) -> Embed:
+        """Baro Ki'Teer's visit and inventory, or his next visit"""
+        embed = discord.Embed(title="💰 Baro Ki'Teer - Void Trader", color=0xFFD700)
+        embed.timestamp = datetime.utcnow()
     
-    async def check_fissure_changes(self, fissures: List[Dict]):
-        """Enhanced fissure change detection with custom filtering"""
-        # Check for specific mission/tier combinations
-        for fissure in fissures:
-            mission_id = fissure.get("id", "")
-            tier = fissure.get("tier", "").lower()
-            mission_type = fissure.get("missionType", "").lower()
+        location = void_trader.location
+    
+        if void_trader.active:
+            embed.add_field(name="Status", value="🟢 **ACTIVE**", inline=True)
+            embed.add_field(name="Location", value=location, inline=True)
+            embed.add_field(name="Leaves In", value=format_discord_timestamp(void_trader.expiry), inline=True)
         
-            # Skip if we've already notified about this mission
-            if f"fissure_{mission_id}" in self.last_notifications:
-                continue
+            # Show inventory
+            inventory = void_trader.inventory
+            if inventory:
+                item_list = []
+                for item in inventory[:10]:  # Limit to 10 items
+                    item_list.append(f"**{item.item}**\n💎 {item.ducats} Ducats + 💰 {item.credits:,} Credits")
             
-            # Mark this mission as notified
-            self.last_notifications[f"fissure_{mission_id}"] = True
-        
-            # Get all subscribers for fissure_missions
-            all_subscribers = self.subscription_manager.get_all_fissure_subscribers()
-        
-            for user_id, subscription_details in all_subscribers.items():
-                # Parse the subscription details
-                should_notify = self.matches_subscription(
-                    subscription_details, tier, mission_type
+                embed.add_field(
+                    name=f"🏪 Inventory ({len(inventory)} items)",
+                    value="\n\n".join(item_list),
+                    inline=False
                 )
-            
-                if should_notify:
-                    try:
-                        user = await self.bot.fetch_user(user_id)
-                        if user:
-                            embed = Embed(
-                                title=f"🔔 {tier.title()} {mission_type.title()} Available!",
-                                description=(
-                                    f"🌀 **{tier.title()} {mission_type.title()} Mission Available!**\n"
-                                    f"📍 {fissure.get('node', 'Unknown')}\n"
-                                    f"🏴 {fissure.get('enemy', 'Unknown')}\n"
-                                    f"⏰ {fissure.get('eta', 'Unknown')} remaining"
-                                ),
-                                color=0x00BCD4
-                            )
-                            embed.timestamp = datetime.utcnow()
-                            await user.send(embed=embed)
-                    except Exception as e:
-                        logging.warning(f"Failed to notify user {user_id}: {e}")
+        else:
+            embed.add_field(name="Status", value="🔴 **NOT ACTIVE**", inline=True)
+        
+            embed.add_field(name="Next Visit", value=format_discord_timestamp(void_trader.activation), inline=True)
+            embed.add_field(name="Next Location", value=location, inline=True)
+        return embed
 
-    def matches_subscription(self, subscription_details: str, tier: str, mission_type: str) -> bool:
-        """Check if a mission matches the user's subscription criteria"""
-        if not subscription_details:
-            return True  # No specific filter means all missions
-    
-        parts = subscription_details.split("|")
-        tier_filter = None
-        mission_filter = None
-    
-        for part in parts:
-            if part.startswith("tier:"):
-                tier_filter = part.split(":", 1)[1].lower()
-            elif part.startswith("mission:"):
-                mission_filter = part.split(":", 1)[1].lower()
-    
-        # Check tier filter
-        if tier_filter and tier_filter != tier:
-            return False
-    
-        # Check mission type filter
-        if mission_filter and mission_filter != mission_type:
+
+class SeenEventStore:
+    """Ids of events that were already notified, kept until the event itself expires"""
+
+    def __init__(self, path: str = SEEN_EVENTS_FILE):
+        self.path = path
+        self.seen = {}              # event id -> expiry epoch
+        self.dirty = False
+        self.last_saved = 0.0
+        self.store = WriteBehindStore(path, lambda: self.seen, indent=None)
+        self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    self.seen = json.load(f)
+                self.evict()
+                logging.info(f"Loaded {len(self.seen)} seen notification events")
+        except Exception as e:
+            logging.error(f"Error loading seen events: {e}")
+
+    def save(self):
+        """Hand the current ids to the write-behind store, which writes them atomically off the loop"""
+        self.store.mark()
+        self.dirty = False
+        self.last_saved = time.monotonic()
+
+    def flush(self, force: bool = False):
+        """Forget expired ids, then write if something changed, at most every SEEN_EVENTS_FLUSH_INTERVAL seconds unless forced"""
+        self.evict()
+        if self.dirty and (force or time.monotonic() - self.last_saved >= SEEN_EVENTS_FLUSH_INTERVAL):
+            self.save()
+
+    async def close(self):
+        """Flush everything and wait for the write to land; used on shutdown"""
+        self.flush(force=True)
+        await self.store.flush()
+
+    def evict(self):
+        """Forget events whose expiry has passed"""
+        now = time.time()
+        expired = [event_id for event_id, expiry in self.seen.items() if expiry <= now]
+        for event_id in expired:
+            del self.seen[event_id]
+        if expired:
+            self.dirty = True
+        bot_metrics.set_gauge("notifications.seen_events", len(self.seen))
+
+    def mark(self, event_id: str, expiry: Optional[int]) -> bool:
+        """Record an event; returns False if it was already seen"""
+        if event_id in self.seen:
             return False
-    
+        self.seen[event_id] = expiry or int(time.time()) + SEEN_EVENTS_DEFAULT_TTL
+        self.dirty = True
         return True
 
+
+class NotificationRule(WorldstateRecord):
+    """Maps one kind of worldstate event onto a notification; the callables take the event's new record"""
+
+    __slots__ = ("name", "kind", "events", "match", "event_id", "subject_mask", "title", "message")
+
+
+# Subscription event types offered by /subscribe, with their labels
+SUBSCRIPTION_EVENTS = {
+    "cetus_night": "Cetus Night (for Eidolon hunting)",
+    "fortuna_warm": "Fortuna Warm (for resource farming)",
+    "fissure_missions": "Fissure Missions (specify tier/mission)",
+    "steel_path_fissures": "Steel Path Fissures",
+    "arbitration": "Arbitration changes",
+    "sortie": "Daily Sortie reset",
+    "baro": "Baro Ki'Teer arrival",
+}
+
+# Evaluated once per worldstate event; recipients come from the subscription index of the rule's events.
+# A rule without subject_mask goes to every subscriber of its events.
+NOTIFICATION_RULES = (
+    NotificationRule(
+        name="cetus_night", kind="cycle_changed", events=("cetus_night",),
+        match=lambda cycle: cycle.location == "cetus" and cycle.state == "night",
+        event_id=lambda cycle: f"cycle:{cycle.id}:{cycle.state}",
+        title=lambda cycle: "🔔 Cetus Night",
+        message=lambda cycle: (
+            f"🌙 **Night has fallen on Cetus!**\n"
+            f"Time for Eidolon hunting!\n"
+            f"⏰ Ends {format_discord_timestamp(cycle.expiry)}"
+        ),
+    ),
+    NotificationRule(
+        name="fortuna_warm", kind="cycle_changed", events=("fortuna_warm",),
+        match=lambda cycle: cycle.location == "fortuna" and cycle.state == "warm",
+        event_id=lambda cycle: f"cycle:{cycle.id}:{cycle.state}",
+        title=lambda cycle: "🔔 Fortuna Warm",
+        message=lambda cycle: (
+            f"🔥 **Orb Vallis is now warm!**\n"
+            f"Perfect for resource farming!\n"
+            f"⏰ Ends {format_discord_timestamp(cycle.expiry)}"
+        ),
+    ),
+    NotificationRule(
+        name="fissure", kind="fissure_added", events=tuple(FISSURE_EVENT_FILTERS),
+        match=None,
+        event_id=lambda fissure: f"fissure:{fissure.id}",
+        subject_mask=lambda fissure: fissure.filter_mask,
+        title=lambda fissure: f"🔔 {fissure.tier.title()} {fissure.mission_type.title()} Available!",
+        message=lambda fissure: (
+            f"🌀 **{fissure.tier.title()} {fissure.mission_type.title()} Mission Available!**\n"
+            f"📍 {fissure.node}\n"
+            f"🏴 {fissure.enemy}\n"
+            f"⏰ Ends {format_discord_timestamp(fissure.expiry)}"
+        ),
+    ),
+    NotificationRule(
+        name="arbitration", kind="arbitration_rollover", events=("arbitration",),
+        match=None,
+        event_id=lambda arbitration: f"arbitration:{arbitration.node}:{arbitration.expiry}",
+        title=lambda arbitration: f"🔔 Arbitration: {arbitration.mission_type}",
+        message=lambda arbitration: (
+            f"⚖️ **New Arbitration: {arbitration.mission_type}**\n"
+            f"📍 {arbitration.node}\n"
+            f"🏴 {arbitration.enemy}\n"
+            f"⏰ Ends {format_discord_timestamp(arbitration.expiry)}"
+        ),
+    ),
+    NotificationRule(
+        name="sortie", kind="sortie_rollover", events=("sortie",),
+        match=None,
+        event_id=lambda sortie: f"sortie:{sortie.id}",
+        title=lambda sortie: f"🔔 New Sortie: {sortie.boss}",
+        message=lambda sortie: (
+            f"🎯 **Today's Sortie: {sortie.boss}** ({sortie.faction})\n"
+            + "".join(f"**{i}.** {variant.mission_type} - {variant.node}\n"
+                      for i, variant in enumerate(sortie.variants or (), 1))
+            + f"⏰ Ends {format_discord_timestamp(sortie.expiry)}"
+        ),
+    ),
+    NotificationRule(
+        name="baro", kind="baro_arrived", events=("baro",),
+        match=None,
+        event_id=lambda trader: f"baro:{trader.id}:{trader.activation}",
+        title=lambda trader: "🔔 Baro Ki'Teer Has Arrived",
+        message=lambda trader: (
+            f"💰 **Baro Ki'Teer is at {trader.location}!**\n"
+            f"🏪 {len(trader.inventory or ())} items for sale\n"
+            f"⏰ Leaves {format_discord_timestamp(trader.expiry)}"
+        ),
+    ),
+)
+
+
+class NotificationManager:
+    """Handles sending notifications to subscribed users"""
     
-    async def notify_subscribers(self, event_type: str, title: str, message: str):
-        """Send notifications to all subscribers of an event type"""
-        subscribers = self.subscription_manager.get_subscribers(event_type)
-        
-        for user_id in subscribers:
-            try:
-                user = await self.bot.fetch_user(user_id)
-                if user:
-                    embed = Embed(title=f"🔔 {title}", description=message, color=0x00BCD4)
+    def __init__(self, bot, subscription_manager: SubscriptionManager, dispatcher: NotificationDispatcher,
+                 seen_events: SeenEventStore, broadcasts: RoleBroadcastManager = None,
+                 rules: Sequence[NotificationRule] = NOTIFICATION_RULES):
+        self.bot = bot
+        self.subscription_manager = subscription_manager
+        self.dispatcher = dispatcher
+        self.seen_events = seen_events
+        self.broadcasts = broadcasts
+        # worldstate event kind -> rules triggered by it
+        self.rules = {}
+        for rule in rules:
+            self.rules.setdefault(rule.kind, []).append(rule)
+        # user id -> {"started": epoch, "entries": [(title, description)]}
+        self.digests = {}
+
+    def subscribe_to(self, differ: WorldstateDiffer):
+        """Have the differ hand over every event kind that some rule reacts to"""
+        for kind in self.rules:
+            differ.subscribe(kind, self.on_events)
+        differ.after_dispatch.append(self.flush_digests)
+        differ.after_dispatch.append(self.seen_events.flush)
+
+    async def on_events(self, events: Sequence[WorldstateEvent]):
+        """Run each event through the rules for its kind and notify whoever subscribed"""
+        now = time.time()
+        marked = False
+        for event in events:
+            record = event.new
+            for rule in self.rules.get(event.kind, ()):
+                if rule.match and not rule.match(record):
+                    continue
+                # Already over, or already announced before a restart
+                if record.expiry and record.expiry <= now:
+                    continue
+                if not self.seen_events.mark(rule.event_id(record), record.expiry):
+                    continue
+                marked = True
+
+                subject_mask = rule.subject_mask(record) if rule.subject_mask else 0
+                recipients = self.subscription_manager.get_recipients(rule.events, subject_mask)
+                targets = self.broadcasts.get_targets(rule.events, subject_mask) if self.broadcasts else ()
+                bot_metrics.increment(f"rules.{rule.name}")
+                if not recipients and not targets:
+                    continue
+                title, message = rule.title(record), rule.message(record)
+                if recipients:
+                    self.deliver(recipients, title, message)
+                if targets:
+                    await self.broadcast(targets, title, message)
+                logging.info(f"🔔 {rule.name} notification for {len(recipients)} users and {len(targets)} roles")
+
+        # Persist straight away, so a restart right after sending doesn't announce these again
+        if marked:
+            self.seen_events.flush(force=True)
+
+    async def broadcast(self, targets, title: str, description: str) -> int:
+        """Post one role-mentioning message per (channel, role); returns how many were sent"""
+        embed = Embed(title=title, description=description, color=0x00BCD4)
+        embed.timestamp = datetime.utcnow()
+
+        async def post(channel_id: int, role_id: int):
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                raise LookupError(f"channel {channel_id} not found")
+            await channel.send(
+                content=f"<@&{role_id}>", embed=embed,
+                allowed_mentions=discord.AllowedMentions(roles=[discord.Object(id=role_id)])
+            )
+
+        targets = list(targets)
+        results = await asyncio.gather(*(post(*target) for target in targets), return_exceptions=True)
+        sent = 0
+        for (channel_id, role_id), result in zip(targets, results):
+            if isinstance(result, Exception):
+                bot_metrics.increment("broadcasts.failed")
+                logging.warning(f"⚠️ Role broadcast to channel {channel_id} failed: {result}")
+            else:
+                sent += 1
+        bot_metrics.increment("broadcasts.sent", sent)
+        return sent
+
+    def deliver(self, user_ids, title: str, description: str):
+        """Send now to 'immediate' users and add to the digest of everyone else"""
+        embed = None
+        now = time.monotonic()
+        for user_id in user_ids:
+            if self.subscription_manager.get_delivery_mode(user_id) == "immediate":
+                if embed is None:
+                    embed = Embed(title=title, description=description, color=0x00BCD4)
                     embed.timestamp = datetime.utcnow()
-                    await user.send(embed=embed)
-            except Exception as e:
-                logging.warning(f"Failed to notify user {user_id}: {e}")
+                self.dispatcher.enqueue(user_id, embed=embed)
+                continue
+
+            digest = self.digests.get(user_id)
+            if digest is None:
+                digest = self.digests[user_id] = {"started": now, "entries": []}
+                if NOTIFICATION_DIGEST_WINDOW > 0:
+                    asyncio.get_running_loop().call_later(NOTIFICATION_DIGEST_WINDOW, self.flush_digest, user_id, digest)
+            digest["entries"].append((title, description))
+
+    def flush_digest(self, user_id: int, digest: dict):
+        """Timer callback: send the digest that armed it, unless it was already sent"""
+        if self.digests.get(user_id) is not digest:
+            return
+        del self.digests[user_id]
+        bot_metrics.increment("notifications.digest_dms", self.send_digest(user_id, digest["entries"]))
+
+    def flush_digests(self, force: bool = False) -> int:
+        """Send every digest whose window has passed as one DM per user; returns DMs queued"""
+        now = time.monotonic()
+        queued = 0
+        for user_id, digest in list(self.digests.items()):
+            if not force and now - digest["started"] < NOTIFICATION_DIGEST_WINDOW:
+                continue
+            del self.digests[user_id]
+            queued += self.send_digest(user_id, digest["entries"])
+
+        bot_metrics.increment("notifications.digest_dms", queued)
+        return queued
+
+    def send_digest(self, user_id: int, entries: list) -> int:
+        """Queue a user's collected notifications, one embed per 25 entries; returns DMs queued"""
+        bot_metrics.increment("notifications.digest_entries", len(entries))
+        if len(entries) == 1:
+            title, description = entries[0]
+            embed = Embed(title=title, description=description, color=0x00BCD4)
+            embed.timestamp = datetime.utcnow()
+            self.dispatcher.enqueue(user_id, embed=embed)
+            return 1
+
+        # Embeds hold at most 25 fields
+        queued = 0
+        for start in range(0, len(entries), 25):
+            chunk = entries[start:start + 25]
+            embed = Embed(title=f"🔔 {len(entries)} Warframe Notifications", color=0x00BCD4)
+            for title, description in chunk:
+                embed.add_field(name=title.replace("🔔 ", ""), value=description[:1024], inline=False)
+            embed.timestamp = datetime.utcnow()
+            self.dispatcher.enqueue(user_id, embed=embed)
+            queued += 1
+        return queued
+
+def upcoming_cycle_state(location: str, state: str):
+    """Reminder start for the next time a cycle enters a state"""
+    return lambda cycle_engine, snapshot: cycle_engine.next_state(location, state)
+
+
+def upcoming_baro(cycle_engine, snapshot: Optional[WorldstateSnapshot]) -> Optional[tuple]:
+    trader = snapshot.void_trader if snapshot else None
+    if trader and not trader.active and trader.activation:
+        return trader.activation, trader
+    return None
+
+
+def upcoming_rollover(attribute: str):
+    """Reminder start for when the current sortie/arbitration is replaced"""
+    def upcoming(cycle_engine, snapshot: Optional[WorldstateSnapshot]) -> Optional[tuple]:
+        record = getattr(snapshot, attribute) if snapshot else None
+        return (record.expiry, record) if record and record.expiry else None
+    return upcoming
+
+
+class ReminderRule(WorldstateRecord):
+    """A subscription event that can be announced ahead of time; next_start(cycle_engine, snapshot) -> (epoch, record)"""
+
+    __slots__ = ("event", "next_start", "title", "message")
+
+
+REMINDER_RULES = (
+    ReminderRule(
+        event="cetus_night", next_start=upcoming_cycle_state("cetus", "night"),
+        title=lambda lead, cycle: f"🔔 Cetus Night in {lead} min",
+        message=lambda start, cycle: (
+            f"🌙 **Night falls on Cetus {format_discord_timestamp(start)}!**\n"
+            f"Get ready for Eidolon hunting."
+        ),
+    ),
+    ReminderRule(
+        event="fortuna_warm", next_start=upcoming_cycle_state("fortuna", "warm"),
+        title=lambda lead, cycle: f"🔔 Fortuna Warm in {lead} min",
+        message=lambda start, cycle: (
+            f"🔥 **Orb Vallis warms up {format_discord_timestamp(start)}!**\n"
+            f"⏰ Lasts until {format_discord_timestamp(cycle.expiry, 't')}"
+        ),
+    ),
+    ReminderRule(
+        event="baro", next_start=upcoming_baro,
+        title=lambda lead, trader: f"🔔 Baro Ki'Teer in {lead} min",
+        message=lambda start, trader: f"💰 **Baro Ki'Teer arrives at {trader.location} {format_discord_timestamp(start)}!**",
+    ),
+    ReminderRule(
+        event="sortie", next_start=upcoming_rollover("sortie"),
+        title=lambda lead, sortie: f"🔔 Sortie resets in {lead} min",
+        message=lambda start, sortie: (
+            f"🎯 **Today's sortie ({sortie.boss}) ends {format_discord_timestamp(start)}!**\n"
+            f"Last chance to finish it."
+        ),
+    ),
+    ReminderRule(
+        event="arbitration", next_start=upcoming_rollover("arbitration"),
+        title=lambda lead, arbitration: f"🔔 Arbitration rotates in {lead} min",
+        message=lambda start, arbitration: (
+            f"⚖️ **{arbitration.mission_type} - {arbitration.node} ends {format_discord_timestamp(start)}**"
+        ),
+    ),
+)
+
+
+class ReminderScheduler:
+    """Fires lead-time reminders from a heap of deadlines; one task sleeps until the earliest, no polling"""
+
+    def __init__(self, subscription_manager: SubscriptionManager, notification_manager: NotificationManager,
+                 rules: Sequence[ReminderRule] = REMINDER_RULES):
+        self.subscription_manager = subscription_manager
+        self.notification_manager = notification_manager
+        self.rules = {rule.event: rule for rule in rules}
+        # (fire_at, sequence, key); entries whose sequence no longer matches self.timers are stale
+        self.heap = []
+        # (event, lead) -> (fire_at, sequence, start, record)
+        self.timers = {}
+        # (event, lead) -> start of the occurrence it last fired for
+        self.fired = {}
+        self.sequence = 0
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.ensure_future(self.run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    def arm(self, key: tuple, fire_at: float, start: float, record):
+        """Set or move a timer; O(log n), the old heap entry is dropped lazily"""
+        current = self.timers.get(key)
+        if current and current[0] == fire_at:
+            self.timers[key] = (fire_at, current[1], start, record)
+            return
+        self.sequence += 1
+        self.timers[key] = (fire_at, self.sequence, start, record)
+        heapq.heappush(self.heap, (fire_at, self.sequence, key))
+        bot_metrics.increment("reminders.rescheduled" if current else "reminders.armed")
+        # Only a new earliest deadline needs to shorten the current sleep
+        if self.heap[0][1] == self.sequence:
+            self.wakeup.set()
+
+    def sync(self, cycle_engine: CycleEngine, snapshot: Optional[WorldstateSnapshot]):
+        """Arm a timer per event and subscribed lead time from the latest worldstate, moving any that shifted"""
+        now = time.time()
+        wanted = set()
+        for event, rule in self.rules.items():
+            leads = self.subscription_manager.lead_times(event)
+            upcoming = rule.next_start(cycle_engine, snapshot) if leads else None
+            if not upcoming:
+                continue
+            start, record = upcoming
+            for lead in leads:
+                key = (event, lead)
+                fired = self.fired.get(key)
+                # A re-anchor can nudge a start that was already announced
+                if fired is not None and abs(fired - start) <= CYCLE_REANCHOR_TOLERANCE:
+                    continue
+                fire_at = start - lead * 60
+                if fire_at <= now:
+                    continue
+                wanted.add(key)
+                self.arm(key, fire_at, start, record)
+
+        for key in set(self.timers) - wanted:
+            del self.timers[key]
+        bot_metrics.set_gauge("reminders.pending", len(self.timers))
+
+    def pop_due(self, now: float) -> List[tuple]:
+        """Remove and return (key, timer) for every timer that is due"""
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            _, sequence, key = heapq.heappop(self.heap)
+            timer = self.timers.get(key)
+            if timer and timer[1] == sequence:
+                due.append((key, self.timers.pop(key)))
+        return due
+
+    async def run(self):
+        while True:
+            self.wakeup.clear()
+            # Skip past entries for timers that were moved or cancelled
+            while self.heap and self.timers.get(self.heap[0][2], (None, None))[1] != self.heap[0][1]:
+                heapq.heappop(self.heap)
+            if not self.heap:
+                await self.wakeup.wait()
+                continue
+
+            delay = self.heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.time()
+            for key, timer in self.pop_due(now):
+                try:
+                    self.fire(key, timer, now)
+                except Exception as e:
+                    logging.error(f"Error firing {key[0]} reminder: {e}")
+            self.notification_manager.flush_digests()
+            bot_metrics.set_gauge("reminders.pending", len(self.timers))
+
+    def fire(self, key: tuple, timer: tuple, now: float):
+        event, lead = key
+        fire_at, _, start, record = timer
+        rule = self.rules[event]
+        self.fired[key] = start
+        bot_metrics.observe("reminders.lateness_seconds", now - fire_at)
+
+        recipients = self.subscription_manager.get_recipients((event,), lead=lead)
+        if not recipients:
+            return
+        bot_metrics.increment("reminders.fired")
+        self.notification_manager.deliver(recipients, rule.title(lead, record), rule.message(start, record))
+        logging.info(f"⏰ {event} reminder ({lead} min) for {len(recipients)} users")
 
 class ChannelManager:
     """Enhanced channel manager that properly edits messages instead of creating new ones"""
@@ -860,6 +3100,11 @@ class ChannelManager:
         self.message_ids_file = "warframe_message_ids.json"  # New file for message IDs
         self.channels = self.load_channels()
         self.message_ids = self.load_message_ids()
+        # Every edit, deletion and discovery marks these; the files are written once per WRITE_BEHIND_DELAY
+        self.channels_store = WriteBehindStore(self.channels_file, lambda: self.channels)
+        self.message_ids_store = WriteBehindStore(self.message_ids_file, lambda: self.message_ids)
+        # (guild id, channel id, panel) -> (message id, fingerprint of the embed it shows)
+        self.fingerprints = {}
 
     def load_message_ids(self) -> dict:
         """Load message IDs from persistent storage"""
@@ -872,12 +3117,8 @@ class ChannelManager:
         return {}
 
     def save_message_ids(self):
-        """Save message IDs to persistent storage"""
-        try:
-            with open(self.message_ids_file, 'w') as f:
-                json.dump(self.message_ids, f, indent=2)
-        except Exception as e:
-            logging.error(f"Error saving message IDs: {e}")
+        """Schedule a write of the message IDs"""
+        self.message_ids_store.mark()
 
     def load_channels(self) -> dict:
         """Load channel configurations from file"""
@@ -890,12 +3131,12 @@ class ChannelManager:
         return {}
 
     def save_channels(self):
-        """Save channel configurations to file"""
-        try:
-            with open(self.channels_file, 'w') as f:
-                json.dump(self.channels, f, indent=2)
-        except Exception as e:
-            logging.error(f"Error saving channels: {e}")
+        """Schedule a write of the channel configurations"""
+        self.channels_store.mark()
+
+    async def flush(self):
+        """Write out pending channel state"""
+        await asyncio.gather(self.channels_store.flush(), self.message_ids_store.flush())
 
     def set_channel(self, guild_id: int, channel_id: int, channel_type: str) -> bool:
         """Set a channel for auto-updates"""
@@ -934,208 +3175,193 @@ class ChannelManager:
             return True
         return False
 
-    async def find_or_create_message(self, channel, embed, message_type):
-        """Find existing bot message to edit, or create new one"""
-        guild_id_str = str(channel.guild.id)
+    @staticmethod
+    def embed_fingerprint(embed: Embed) -> str:
+        """Hash of what an embed shows, ignoring its render timestamp"""
+        content = embed.to_dict()
+        content.pop("timestamp", None)
+        return hashlib.sha1(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+    def is_unchanged(self, channel, panel: str, message_id: int, fingerprint: str) -> bool:
+        """True if the message already shows this content, counting the skipped edit"""
+        if self.fingerprints.get((channel.guild.id, channel.id, panel)) != (message_id, fingerprint):
+            return False
+        self.record_edit(skipped=True)
+        return True
 
-        if guild_id_str not in self.message_ids:
-            self.message_ids[guild_id_str] = {}
+    def remember_edit(self, channel, panel: str, message_id: int, fingerprint: str):
+        self.fingerprints[(channel.guild.id, channel.id, panel)] = (message_id, fingerprint)
+        self.record_edit(skipped=False)
 
-        # Try to find existing message by stored ID
-        stored_message_id = self.message_ids[guild_id_str].get(message_type)
-        if stored_message_id:
+    @staticmethod
+    def record_edit(skipped: bool):
+        bot_metrics.increment("channels.edits_skipped" if skipped else "channels.edits")
+        skipped_count = bot_metrics.get("channels.edits_skipped")
+        bot_metrics.set_gauge("channels.skipped_edit_ratio", skipped_count / (skipped_count + bot_metrics.get("channels.edits")))
+
+    async def publish_panel(self, channel, embed: Embed, panel: str, slots: dict, slot: str):
+        """Edit the panel's stored message by id; send a new one only if there is none or it was deleted"""
+        fingerprint = self.embed_fingerprint(embed)
+        message_id = slots.get(slot)
+        if message_id:
+            # Relative timestamps tick client-side, so an unchanged embed needs no REST call at all
+            if self.is_unchanged(channel, panel, message_id, fingerprint):
+                return
             try:
-                message = await channel.fetch_message(stored_message_id)
-                if message.author == self.bot.user:
-                    await message.edit(embed=embed)
-                    logging.info(f"Successfully edited {message_type} message in {channel.name}")
-                    return
-            except discord.NotFound:
-                # Message was deleted, remove from storage
-                logging.info(f"Stored {message_type} message was deleted, will create new one")
-                del self.message_ids[guild_id_str][message_type]
+                # A partial message edits by id without fetching the message first
+                await channel.get_partial_message(message_id).edit(embed=embed)
+                self.remember_edit(channel, panel, message_id, fingerprint)
+                logging.info(f"Edited {panel} message in {channel.name} (ID: {message_id})")
+                return
+            except (discord.NotFound, discord.Forbidden) as e:
+                # Deleted, or the id now points at a message the bot can't edit (e.g. someone else's)
+                reason = "was deleted" if isinstance(e, discord.NotFound) else "can't be edited by the bot"
+                logging.info(f"Stored {panel} message {reason}, will create new one")
+                del slots[slot]
                 self.save_message_ids()
             except Exception as e:
-                logging.error(f"Error editing {message_type} message: {e}")
-
-        # If no stored message or editing failed, look for recent bot messages
-        try:
-            async for message in channel.history(limit=30):
-                if (
-                    message.author == self.bot.user
-                    and message.embeds and len(message.embeds) > 0
-                    and message_type.lower() in message.embeds[0].title.lower()
-                ):
-                    await message.edit(embed=embed)
-                    # Store this message ID for future edits
-                    self.message_ids[guild_id_str][message_type] = message.id
-                    self.save_message_ids()
-                    logging.info(f"Found and edited existing {message_type} message in {channel.name}")
-                    return
-        except Exception as e:
-            logging.error(f"Error searching for existing {message_type} messages: {e}")
-
-        # No existing message found, create new one
-        try:
-            new_message = await channel.send(embed=embed)
-            self.message_ids[guild_id_str][message_type] = new_message.id
-            self.save_message_ids()
-            logging.info(f"Created new {message_type} message in {channel.name}")
-        except Exception as e:
-            logging.error(f"Error creating new {message_type} message: {e}")
-
-    async def update_fissures_channel(self, channel, embed_generator, data_manager):
-        """Update fissures channel with separate embeds that edit existing messages"""
-        try:
-            guild_id_str = str(channel.guild.id)
-            fissures_by_type = await data_manager.get_fissures_by_type()
-            api_status = data_manager.get_current_api_status()
-
-            if guild_id_str not in self.message_ids:
-                self.message_ids[guild_id_str] = {}
-            if "fissures" not in self.message_ids[guild_id_str]:
-                self.message_ids[guild_id_str]["fissures"] = {}
-
-            for mission_type in ["normal", "steel_path", "railjack"]:
-                fissures = fissures_by_type[mission_type]
-
-                # Create embed even if no missions (to show "No active missions")
-                embed = embed_generator.create_fissures_embed(fissures, mission_type, api_status)
-
-                stored_message_id = self.message_ids[guild_id_str]["fissures"].get(mission_type)
-                if stored_message_id:
-                    try:
-                        message = await channel.fetch_message(stored_message_id)
-                        if message.author == self.bot.user:
-                            await message.edit(embed=embed)
-                            logging.info(f"Edited {mission_type} fissures message (ID: {stored_message_id})")
-                            continue
-                    except discord.NotFound:
-                        logging.info(f"Stored {mission_type} message was deleted, will create new one")
-                        del self.message_ids[guild_id_str]["fissures"][mission_type]
-                        self.save_message_ids()
-                    except Exception as e:
-                        logging.error(f"Error editing {mission_type} fissures message: {e}")
-
-                found_message = False
-                try:
-                    async for message in channel.history(limit=50):
-                        if (
-                            message.author == self.bot.user
-                            and message.embeds and len(message.embeds) > 0
-                            and mission_type.title() in message.embeds[0].title
-                        ):
-                            await message.edit(embed=embed)
-                            self.message_ids[guild_id_str]["fissures"][mission_type] = message.id
-                            self.save_message_ids()
-                            logging.info(f"Found and edited {mission_type} fissures message (ID: {message.id})")
-                            found_message = True
-                            break
-                except Exception as e:
-                    logging.error(f"Error searching for {mission_type} fissures message: {e}")
-
-                if not found_message:
-                    try:
-                        new_message = await channel.send(embed=embed)
-                        self.message_ids[guild_id_str]["fissures"][mission_type] = new_message.id
-                        self.save_message_ids()
-                        logging.info(f"Created new {mission_type} fissures message (ID: {new_message.id})")
-                    except Exception as e:
-                        logging.error(f"Error creating {mission_type} fissures message: {e}")
-
-            # Clean up any message IDs for mission types that no longer exist
-            valid_types = ["normal", "steel_path", "railjack"]
-            if "fissures" in self.message_ids[guild_id_str]:
-                for mission_type in list(self.message_ids[guild_id_str]["fissures"].keys()):
-                    if mission_type not in valid_types:
-                        del self.message_ids[guild_id_str]["fissures"][mission_type]
-                        self.save_message_ids()
-
-        except Exception as e:
-            logging.error(f"Error updating fissures channel {channel.name}: {e}")
-
-    async def update_channels(self, embed_generator: EmbedGenerator, data_manager: WarframeDataManager):
-        """Update all configured channels with latest data and API status"""
-        for guild_id_str, guild_channels in self.channels.items():
-            try:
-                guild = self.bot.get_guild(int(guild_id_str))
-                if not guild:
-                    continue
-
-                # Fetch current API status
-                api_status = data_manager.get_current_api_status()
+                logging.error(f"Error editing {panel} message: {e}")
+                return
 
-                # Update cycles channel
-                if "cycles" in guild_channels:
-                    channel = guild.get_channel(guild_channels["cycles"])
-                    if channel:
-                        try:
-                            cycles_data = await data_manager.get_cycles()
-                            embed = embed_generator.create_cycles_embed(cycles_data, api_status)
-                            await self.find_or_create_message(channel, embed, "cycles")
-                        except Exception as e:
-                            logging.error(f"Error updating cycles channel: {e}")
-
-                # Update fissures channel
-                if "fissures" in guild_channels:
-                    channel = guild.get_channel(guild_channels["fissures"])
-                    if channel:
-                        await self.update_fissures_channel(channel, embed_generator, data_manager)
+        try:
+            new_message = await channel.send(embed=embed)
+            self.remember_edit(channel, panel, new_message.id, fingerprint)
+            slots[slot] = new_message.id
+            self.save_message_ids()
+            logging.info(f"Created new {panel} message in {channel.name} (ID: {new_message.id})")
+        except Exception as e:
+            logging.error(f"Error creating new {panel} message: {e}")
 
-            except Exception as e:
-                logging.error(f"Error updating channels for guild {guild_id_str}: {e}")
+    async def find_or_create_message(self, channel, embed, message_type):
+        """Edit the stored bot message, or create a new one"""
+        slots = self.message_ids.setdefault(str(channel.guild.id), {})
+        await self.publish_panel(channel, embed, message_type, slots, message_type)
 
+    async def update_fissures_channel(self, channel, fissure_embeds: Dict[str, Embed]):
+        """Update fissures channel with separate embeds that edit existing messages"""
+        try:
+            slots = self.message_ids.setdefault(str(channel.guild.id), {}).setdefault("fissures", {})
 
-# =============================================================================
-# ENHANCED UPDATE LOOP WITH BETTER ERROR HANDLING
-# =============================================================================
+            for mission_type in FISSURE_KINDS:
+                if mission_type not in fissure_embeds:
+                    continue
+                # Embeds exist even if no missions (to show "No active missions")
+                await self.publish_panel(
+                    channel, fissure_embeds[mission_type], f"fissures.{mission_type}", slots, mission_type
+                )
 
-@tasks.loop(minutes=5)
-async def warframe_info_update_loop():
-    """Enhanced update loop with better error handling and logging"""
-    global warframe_data_manager, notification_manager, channel_manager, embed_generator
+            # Clean up any message IDs for mission types that no longer exist
+            for mission_type in list(slots.keys()):
+                if mission_type not in FISSURE_KINDS:
+                    del slots[mission_type]
+                    self.save_message_ids()
 
-    if not all([warframe_data_manager, notification_manager, channel_manager, embed_generator]):
-        logging.warning("Not all components initialized, skipping update")
-        return
+        except Exception as e:
+            logging.error(f"Error updating fissures channel {channel.name}: {e}")
 
-    try:
-        logging.info("Starting Warframe info update loop...")
-        
-        # Get latest data with error handling
-        cycles_data = await warframe_data_manager.get_cycles()
-        if cycles_data:
-            logging.info(f"Retrieved cycles data for {len(cycles_data)} locations")
+    async def reconcile_channel(self, channel, channel_type: str) -> int:
+        """Adopt existing bot panels for slots without a stored id, in one history scan; returns how many were found"""
+        guild_ids = self.message_ids.setdefault(str(channel.guild.id), {})
+        if channel_type == "fissures":
+            slots = guild_ids.setdefault("fissures", {})
+            wanted = [kind for kind in FISSURE_KINDS if kind not in slots]
         else:
-            logging.warning("Failed to retrieve cycles data")
+            slots = guild_ids
+            wanted = [channel_type] if channel_type not in slots else []
+        if not wanted:
+            return 0
 
-        fissures = await warframe_data_manager.get_fissures()
-        if fissures:
-            logging.info(f"Retrieved {len(fissures)} fissure missions")
-        else:
-            logging.warning("Failed to retrieve fissures data")
+        found = 0
+        try:
+            # Newest first, so the most recent panel of each kind wins
+            async for message in channel.history(limit=RECONCILE_HISTORY_LIMIT):
+                # Only the bot's own messages can be edited, so never adopt anyone else's
+                if message.author.id != self.bot.user.id or not message.embeds:
+                    continue
+                title = (message.embeds[0].title or "").lower()
+                for slot in wanted:
+                    if slot.replace("_", " ") in title:
+                        slots[slot] = message.id
+                        wanted.remove(slot)
+                        found += 1
+                        break
+                if not wanted:
+                    break
+        except Exception as e:
+            logging.error(f"Error reconciling {channel_type} messages in {channel.name}: {e}")
 
-        # ADD THIS: Log API status
-        api_status = warframe_data_manager.get_current_api_status()
-        if not api_status["working"]:
-            logging.warning(f"⚠️ API Status: {api_status['message']}")
-        else:
-            logging.info(f"✅ API Status: Using {api_status['api_name']}")
+        if found:
+            self.save_message_ids()
+            logging.info(f"Adopted {found} existing {channel_type} message(s) in {channel.name}")
+        bot_metrics.increment("channels.reconciled_panels", found)
+        return found
+
+    async def reconcile(self) -> int:
+        """Reconcile every configured channel once; the update loop itself never scans history"""
+        scans = []
+        for guild_id_str, guild_channels in list(self.channels.items()):
+            guild = self.bot.get_guild(int(guild_id_str))
+            if not guild:
+                continue
+            for channel_type, channel_id in guild_channels.items():
+                channel = guild.get_channel(channel_id)
+                if channel:
+                    scans.append(self.reconcile_channel(channel, channel_type))
+        results = await asyncio.gather(*scans, return_exceptions=True)
+        return sum(result for result in results if isinstance(result, int))
 
-        # Check for changes and notify subscribers
-        if cycles_data:
-            await notification_manager.check_cycle_changes(cycles_data)
-        if fissures:
-            await notification_manager.check_fissure_changes(fissures)
+    async def update_channels(self, embed_generator: EmbedGenerator, data_manager: WarframeDataManager):
+        """Update all configured channels with latest data and API status"""
+        snapshot = await data_manager.get_snapshot()
+        embeds = embed_generator.create_channel_embeds(
+            await data_manager.get_cycles(), snapshot, data_manager.get_current_api_status()
+        )
+        return await self.publish(embeds)
+
+    async def publish(self, embeds: Dict) -> int:
+        """Push pre-rendered panels to every configured guild; returns the number of channels updated"""
+        # Guilds have separate rate limits, so one slow guild shouldn't hold up the rest
+        results = await asyncio.gather(
+            *(self.publish_guild(guild_id_str, guild_channels, embeds)
+              for guild_id_str, guild_channels in list(self.channels.items())),
+            return_exceptions=True
+        )
+        updated = 0
+        for result in results:
+            if isinstance(result, Exception):
+                logging.error(f"Error publishing to a guild: {result}")
+            else:
+                updated += result
+        return updated
 
-        # Update auto-updating channels
-        logging.info("Updating auto-updating channels...")
-        await channel_manager.update_channels(embed_generator, warframe_data_manager)
-        
-        logging.info("Warframe info update loop completed successfully")
+    async def publish_guild(self, guild_id_str: str, guild_channels: dict, embeds: Dict) -> int:
+        """Update one guild's configured channels"""
+        updated = 0
+        try:
+            guild = self.bot.get_guild(int(guild_id_str))
+            if not guild:
+                return 0
 
-    except Exception as e:
-        logging.error(f"Error in Warframe info update loop: {e}")
+            # Update cycles channel
+            if "cycles" in guild_channels and "cycles" in embeds:
+                channel = guild.get_channel(guild_channels["cycles"])
+                if channel:
+                    try:
+                        await self.find_or_create_message(channel, embeds["cycles"], "cycles")
+                        updated += 1
+                    except Exception as e:
+                        logging.error(f"Error updating cycles channel: {e}")
+
+            # Update fissures channel
+            if "fissures" in guild_channels and embeds.get("fissures"):
+                channel = guild.get_channel(guild_channels["fissures"])
+                if channel:
+                    await self.update_fissures_channel(channel, embeds["fissures"])
+                    updated += 1
+
+        except Exception as e:
+            logging.error(f"Error updating channels for guild {guild_id_str}: {e}")
+        return updated
 
 
 # =============================================================================
@@ -1192,6 +3418,10 @@ async def set_cycles_channel_command(
         )
     
     await interaction.response.send_message(embed=embed)
+    
+    # Adopt the panel messages that are already in the channel (including the test update)
+    if success:
+        await channel_manager.reconcile_channel(channel, "cycles")
 
 @bot.tree.command(name="set-fissures-channel", description="Set channel for auto-updating fissure information")
 @app_commands.describe(channel="The channel to use for fissure updates")
@@ -1253,6 +3483,10 @@ async def set_fissures_channel_command(
         )
     
     await interaction.response.send_message(embed=embed)
+    
+    # Adopt the panel messages that are already in the channel (including the test update)
+    if success:
+        await channel_manager.reconcile_channel(channel, "fissures")
 
 @bot.tree.command(name="test-channels", description="Test all configured auto-update channels")
 @app_commands.default_permissions(administrator=True)
@@ -1298,18 +3532,19 @@ async def test_channels_command(interaction: discord.Interaction):
 # ALL EXISTING RELIC COMPARISON SYSTEM (PRESERVED COMPLETELY)
 # =============================================================================
 
-def fetch_and_save_relic_data():
+async def fetch_and_save_relic_data():
     """Fetch relic data from external sources and save to relic_data.json."""
     drops_url = "https://raw.githubusercontent.com/WFCD/warframe-drop-data/main/data/relics.json"
     vaulted_url = "https://api.warframestat.us/items"
     
-    response = requests.get(drops_url)
-    response.raise_for_status()
-    data = response.json()
+    session = await http_client_manager.get_session()
+    async with session.get(drops_url, timeout=aiohttp.ClientTimeout(total=60)) as response:
+        response.raise_for_status()
+        data = await response.json(content_type=None)
     
     try:
-        items_response = requests.get(vaulted_url, timeout=10)
-        items_data = items_response.json() if items_response.status_code == 200 else []
+        async with session.get(vaulted_url, timeout=aiohttp.ClientTimeout(total=10)) as items_response:
+            items_data = await items_response.json(content_type=None) if items_response.status == 200 else []
     except Exception:
         items_data = []
     
@@ -1336,11 +3571,16 @@ def fetch_and_save_relic_data():
                 "vaulted": vaulted
             }
     
-    with open("relic_data.json", "w", encoding="utf-8") as f:
-        json.dump(relic_data, f, indent=2, ensure_ascii=False)
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, save_relic_data_file, relic_data)
     
     return len(relic_data), sum(1 for r in relic_data.values() if r["vaulted"])
 
+def save_relic_data_file(relic_data):
+    """Write relic data to relic_data.json"""
+    with open("relic_data.json", "w", encoding="utf-8") as f:
+        json.dump(relic_data, f, indent=2, ensure_ascii=False)
+
 def load_relic_data():
     """Load relic data from the JSON file"""
     global RELIC_DATA
@@ -1464,13 +3704,13 @@ async def fetch_platinum_prices(item_names: list) -> Dict[str, Optional[float]]:
         logging.info(f"Fetching prices for {len(uncached_items)} items...")
         sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         
-        async with aiohttp.ClientSession() as session:
-            tasks = [
-                fetch_price_concurrent(session, sem, item_name, api_name)
-                for item_name, api_name in uncached_items
-            ]
-            
-            results = await asyncio.gather(*tasks)
+        session = await http_client_manager.get_session()
+        tasks = [
+            fetch_price_concurrent(session, sem, item_name, api_name)
+            for item_name, api_name in uncached_items
+        ]
+
+        results = await asyncio.gather(*tasks)
         
         # Store results in cache and prices dict
         for item_name, result in zip(uncached_names, results):
@@ -2006,20 +4246,13 @@ def load_price_cache():
         PLATINUM_CACHE = {}
         LAST_CACHE_UPDATE = 0
 
+price_cache_store = WriteBehindStore(
+    PRICE_CACHE_FILE, lambda: {'prices': PLATINUM_CACHE, 'last_update': LAST_CACHE_UPDATE}
+)
+
 def save_price_cache():
-    """Save platinum price cache to disk"""
-    try:
-        cache_data = {
-            'prices': PLATINUM_CACHE,
-            'last_update': LAST_CACHE_UPDATE
-        }
-        
-        with open(PRICE_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, indent=2, ensure_ascii=False)
-        
-        logging.info(f"Saved {len(PLATINUM_CACHE)} prices to cache file")
-    except Exception as e:
-        logging.error(f"Error saving price cache: {e}")
+    """Schedule a write of the platinum price cache"""
+    price_cache_store.mark()
 
 def generate_or_load_key():
     """Generate or load encryption key for storing API tokens"""
@@ -2135,33 +4368,219 @@ async def before_auto_update():
 # WARFRAME INFORMATION SYSTEM BACKGROUND TASK
 # =============================================================================
 
-@tasks.loop(minutes=5)
+class UpdateScheduler:
+    """Picks the next update instant from the upcoming expiries in the worldstate"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.next_target = None
+        self.next_event = None
+        self.next_reason = None
+        self.next_needs_refresh = False
+
+    @staticmethod
+    def upcoming_events(cycles: Dict[str, Cycle], snapshot: Optional[WorldstateSnapshot]) -> List[tuple]:
+        """(epoch, reason, needs_refresh) for everything that is about to change"""
+        # Cycles come from the local engine, so their rollovers need no refetch
+        events = [(cycle.expiry, f"{location} cycle", False) for location, cycle in cycles.items()]
+        if not snapshot:
+            return events
+
+        events.extend((fissure.expiry, "fissure expiry", True) for fissure in snapshot.fissures)
+        if snapshot.sortie:
+            events.append((snapshot.sortie.expiry, "sortie rollover", True))
+        if snapshot.arbitration:
+            events.append((snapshot.arbitration.expiry, "arbitration rollover", True))
+        if snapshot.steel_path:
+            events.append((snapshot.steel_path.expiry, "steel path rollover", True))
+        if snapshot.void_trader:
+            trader = snapshot.void_trader
+            events.append((trader.expiry if trader.active else trader.activation, "Baro rollover", True))
+        return events
+
+    def record_wake(self, now: float) -> bool:
+        """Record how late this wake-up is for its event; returns whether a refetch is due"""
+        bot_metrics.increment("scheduler.wakeups")
+        bot_metrics.set_gauge("scheduler.fixed_loop_ticks", int((now - self.started_at) // UPDATE_MAX_INTERVAL) + 1)
+
+        if self.next_target is None or now < self.next_target:
+            return False
+
+        # How long after the event we acted, against when the old 5 minute loop would have
+        bot_metrics.observe("scheduler.event_latency_seconds", now - self.next_event)
+        bot_metrics.observe(
+            "scheduler.fixed_loop_latency_seconds",
+            (self.started_at - self.next_event) % UPDATE_MAX_INTERVAL
+        )
+        return self.next_needs_refresh
+
+    def plan(self, now: float, cycles: Dict[str, Cycle], snapshot: Optional[WorldstateSnapshot]) -> float:
+        """Choose the next wake-up and return the interval until it"""
+        upcoming = [
+            (epoch + (UPDATE_EXPIRY_GRACE if needs_refresh else 1), epoch, reason, needs_refresh)
+            for epoch, reason, needs_refresh in self.upcoming_events(cycles, snapshot)
+            if epoch and epoch + UPDATE_EXPIRY_GRACE > now
+        ]
+
+        self.next_target, self.next_event, self.next_reason, self.next_needs_refresh = (
+            min(upcoming) if upcoming else (None, None, None, False)
+        )
+        interval = UPDATE_MAX_INTERVAL if self.next_target is None else self.next_target - now
+        interval = min(max(interval, UPDATE_MIN_INTERVAL), UPDATE_MAX_INTERVAL)
+
+        # The ceiling won, so this wake is a routine poll rather than an event
+        if self.next_target is not None and self.next_target > now + interval:
+            self.next_target, self.next_event, self.next_reason, self.next_needs_refresh = None, None, None, False
+
+        bot_metrics.observe("scheduler.interval_seconds", interval)
+        logging.debug(f"Next update in {interval:.0f}s ({self.next_reason or 'routine poll'})")
+        return interval
+
+update_scheduler = UpdateScheduler()
+
+class UpdatePipeline:
+    """One update pass as explicit stages: fetch -> normalise -> diff -> (notify | render -> publish)"""
+
+    def __init__(self, data_manager: WarframeDataManager, differ: WorldstateDiffer,
+                 channel_manager: ChannelManager, embed_generator: EmbedGenerator,
+                 reminders: ReminderScheduler = None):
+        self.data_manager = data_manager
+        self.differ = differ
+        self.reminders = reminders
+        self.channel_manager = channel_manager
+        self.embed_generator = embed_generator
+
+    async def run_stage(self, name: str, stage, context: dict) -> int:
+        """Run one stage, recording its wall time and item count"""
+        started = time.perf_counter()
+        items = await stage(context)
+        elapsed = time.perf_counter() - started
+
+        context["timings"][name] = elapsed
+        bot_metrics.observe(f"pipeline.stage_seconds.{name}", elapsed)
+        bot_metrics.set_gauge(f"pipeline.stage_items.{name}", items)
+        if elapsed > PIPELINE_SLOW_STAGE_SECONDS:
+            bot_metrics.increment(f"pipeline.slow_stages.{name}")
+            logging.warning(f"🐢 Update stage '{name}' took {elapsed:.1f}s ({items} items)")
+        return items
+
+    async def run(self, refresh: bool = False) -> dict:
+        """Run a full update pass and return its context"""
+        context = {"refresh": refresh, "timings": {}}
+        started = time.perf_counter()
+
+        await self.run_stage("fetch", self.fetch, context)
+        await self.run_stage("normalise", self.normalise, context)
+        await self.run_stage("diff", self.diff, context)
+
+        # DMs don't wait on channel edits, and channel edits don't wait on DMs
+        results = await asyncio.gather(
+            self.run_stage("notify", self.notify, context),
+            self.render_and_publish(context),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logging.error(f"Error in update pipeline: {result}")
+
+        elapsed = time.perf_counter() - started
+        bot_metrics.increment("pipeline.runs")
+        bot_metrics.observe("pipeline.total_seconds", elapsed)
+        stage_summary = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in context["timings"].items())
+        logging.info(f"Update pipeline finished in {elapsed:.2f}s ({stage_summary})")
+        return context
+
+    async def render_and_publish(self, context: dict):
+        await self.run_stage("render", self.render, context)
+        await self.run_stage("publish", self.publish, context)
+
+    async def fetch(self, context: dict) -> int:
+        # Something in the worldstate just rolled over, so don't serve it from cache
+        if context["refresh"]:
+            await self.data_manager.refresh()
+        context["snapshot"] = await self.data_manager.get_snapshot()
+        return 1 if context["snapshot"] else 0
+
+    async def normalise(self, context: dict) -> int:
+        snapshot = context["snapshot"]
+        context["cycles"] = await self.data_manager.get_cycles()
+        context["fissures"] = snapshot.fissures if snapshot else ()
+        context["fissures_by_type"] = snapshot.fissures_by_type if snapshot else {kind: () for kind in FISSURE_KINDS}
+        context["api_status"] = self.data_manager.get_current_api_status()
+        if not context["api_status"]["working"]:
+            logging.warning(f"⚠️ API Status: {context['api_status']['message']}")
+        return len(context["cycles"]) + len(context["fissures"])
+
+    async def diff(self, context: dict) -> int:
+        context["events"] = self.differ.diff(context["cycles"], context["snapshot"])
+        return len(context["events"])
+
+    async def notify(self, context: dict) -> int:
+        # Expiries in the new snapshot may have moved reminder timers
+        if self.reminders:
+            self.reminders.sync(self.data_manager.cycle_engine, context["snapshot"])
+        return await self.differ.dispatch(context["events"])
+
+    async def render(self, context: dict) -> int:
+        """Render every panel each tick; unchanged ones come from the render cache and are skipped by fingerprint"""
+        # Rendering everything means a failed edit or a newly configured channel is retried on the next tick
+        embeds = {"fissures": {}}
+        embeds["cycles"] = self.embed_generator.cycles_panel(context["cycles"], context["api_status"])
+        for kind in FISSURE_KINDS:
+            embeds["fissures"][kind] = self.embed_generator.fissures_panel(
+                context["snapshot"], kind, context["api_status"]
+            )
+
+        context["embeds"] = embeds
+        return len(embeds["fissures"]) + ("cycles" in embeds)
+
+    async def publish(self, context: dict) -> int:
+        embeds = context["embeds"]
+        if "cycles" not in embeds and not embeds["fissures"]:
+            return 0
+        return await self.channel_manager.publish(embeds)
+
+@tasks.loop(seconds=UPDATE_MAX_INTERVAL)
 async def warframe_info_update_loop():
-    """Main update loop for Warframe information system"""
-    global warframe_data_manager, notification_manager, channel_manager, embed_generator
-    
-    if not all([warframe_data_manager, notification_manager, channel_manager, embed_generator]):
+    """Main update loop for Warframe information system, woken at the next expiry"""
+    if not update_pipeline:
         return
     
+    # The loop schedules relative to the start of this iteration
+    tick_started = time.time()
+    context = {}
     try:
-        # Get latest data
-        cycles_data = await warframe_data_manager.get_cycles()
-        fissures = await warframe_data_manager.get_fissures()
-        
-        # Check for changes and notify subscribers
-        await notification_manager.check_cycle_changes(cycles_data)
-        await notification_manager.check_fissure_changes(fissures)
-        
-        # Update auto-updating channels
-        await channel_manager.update_channels(embed_generator, warframe_data_manager)
-        
+        context = await update_pipeline.run(refresh=update_scheduler.record_wake(tick_started))
     except Exception as e:
         logging.error(f"Error in Warframe info update loop: {e}")
+    
+    try:
+        snapshot = context.get("snapshot") or await warframe_data_manager.get_snapshot()
+        interval = update_scheduler.plan(tick_started, await warframe_data_manager.get_cycles(), snapshot)
+    except Exception as e:
+        logging.error(f"Error planning next Warframe info update: {e}")
+        interval = UPDATE_MAX_INTERVAL
+    warframe_info_update_loop.change_interval(seconds=interval)
 
 @warframe_info_update_loop.before_loop
 async def before_warframe_info_update_loop():
     await bot.wait_until_ready()
 
+@tasks.loop(seconds=CIRCUIT_PROBE_INTERVAL)
+async def api_health_probe_loop():
+    """Background prober that tests open API circuits"""
+    if not warframe_data_manager:
+        return
+    
+    try:
+        await warframe_data_manager.probe_open_circuits()
+    except Exception as e:
+        logging.error(f"Error probing API circuits: {e}")
+
+@api_health_probe_loop.before_loop
+async def before_api_health_probe_loop():
+    await bot.wait_until_ready()
+
 # =============================================================================
 # ENHANCED SLASH COMMANDS - RELIC COMPARISON SYSTEM (ALL PRESERVED)
 # =============================================================================
@@ -2255,13 +4674,8 @@ async def compare(
     
     # Generate enhanced report with platinum values
     try:
-        user_names = {}
-        for user_id in users:
-            try:
-                user = await bot.fetch_user(int(user_id))
-                user_names[user_id] = user.display_name or user.global_name or user.name
-            except:
-                user_names[user_id] = f"User_{user_id}"
+        names = await asyncio.gather(*(user_cache.get_display_name(user_id) for user_id in users))
+        user_names = dict(zip(users, names))
         
         # Pass platinum data to report function
         report_text = generate_full_detailed_report_with_platinum(
@@ -2289,9 +4703,8 @@ async def update_relics(interaction: discord.Interaction):
     
     await interaction.response.defer()
     
-    loop = asyncio.get_event_loop()
     try:
-        total_relics, vaulted_count = await loop.run_in_executor(None, fetch_and_save_relic_data)
+        total_relics, vaulted_count = await fetch_and_save_relic_data()
         
         # Reload relic data in bot memory after update
         if load_relic_data():
@@ -2357,7 +4770,7 @@ async def cycles_command(interaction: discord.Interaction):
         await interaction.followup.send("❌ Failed to fetch cycle information.")
         return
     
-    embed = embed_generator.create_cycles_embed(cycles_data, api_status)  # pass api_status here
+    embed = embed_generator.cycles_panel(cycles_data, api_status)
     await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="fissures", description="Show void fissures in separate embeds by type")
@@ -2377,7 +4790,8 @@ async def fissures_command(
     """Display fissures in separate embeds by type"""
     await interaction.response.defer()
     
-    fissures_by_type = await warframe_data_manager.get_fissures_by_type()
+    snapshot = await warframe_data_manager.get_snapshot()
+    fissures_by_type = snapshot.fissures_by_type if snapshot else {kind: () for kind in FISSURE_KINDS}
     api_status = warframe_data_manager.get_current_api_status()  # Fetch API status
     
     if not any(fissures_by_type.values()):
@@ -2396,7 +4810,7 @@ async def fissures_command(
         for mission_type in ["normal", "steel_path", "railjack"]:
             fissures = fissures_by_type[mission_type]
             if fissures:
-                embed = embed_generator.create_fissures_embed(fissures, mission_type, api_status)
+                embed = embed_generator.fissures_panel(snapshot, mission_type, api_status)
                 await interaction.followup.send(embed=embed)
                 embeds_sent += 1
         
@@ -2410,8 +4824,7 @@ async def fissures_command(
             await interaction.followup.send(embed=msg_embed)
     
     else:
-        fissures = fissures_by_type.get(fissure_type, [])
-        embed = embed_generator.create_fissures_embed(fissures, fissure_type, api_status)
+        embed = embed_generator.fissures_panel(snapshot, fissure_type, api_status)
         await interaction.followup.send(embed=embed)
 
 
@@ -2420,33 +4833,14 @@ async def steel_path_command(interaction: discord.Interaction):
     """Display Steel Path information"""
     await interaction.response.defer()
     
-    steel_path_data = await warframe_data_manager.get_steel_path_info()
-    if not steel_path_data:
+    snapshot = await warframe_data_manager.get_snapshot()
+    if not snapshot or not snapshot.steel_path:
         await interaction.followup.send("❌ Failed to fetch Steel Path information.")
         return
     
-    embed = discord.Embed(title="🔥 Steel Path", color=0xE91E63)
-    embed.timestamp = datetime.utcnow()
-    
-    # Current reward
-    current_reward = steel_path_data.get("currentReward", {})
-    if current_reward:
-        reward_name = current_reward.get("name", "Unknown")
-        reward_cost = current_reward.get("cost", 0)
-        embed.add_field(
-            name="🎁 Current Reward",
-            value=f"**{reward_name}**\n💎 {reward_cost} Steel Essence",
-            inline=True
-        )
-    
-    # Time remaining
-    remaining = steel_path_data.get("remaining", "Unknown")
-    embed.add_field(
-        name="⏰ Time Remaining",
-        value=remaining,
-        inline=True
+    embed = embed_generator.render(
+        "steel_path", snapshot.version, None, lambda: EmbedGenerator.create_steel_path_embed(snapshot.steel_path)
     )
-    
     await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="arbitration", description="Show current arbitration mission")
@@ -2454,31 +4848,13 @@ async def arbitration_command(interaction: discord.Interaction):
     """Display current arbitration"""
     await interaction.response.defer()
     
-    arbitration_data = await warframe_data_manager.get_arbitration()
-    
-    embed = discord.Embed(title="⚖️ Arbitration", color=0x9C27B0)
-    embed.timestamp = datetime.utcnow()
-    
-    if not arbitration_data:
-        embed.description = "No active arbitration mission"
-    else:
-        node = arbitration_data.get("node", "Unknown")
-        mission_type = arbitration_data.get("type", "Unknown")
-        enemy = arbitration_data.get("enemy", "Unknown")
-        eta = arbitration_data.get("eta", "Unknown")
-        
-        embed.add_field(
-            name="🎯 Current Mission",
-            value=f"**{mission_type}** - {node}\n🏴 {enemy}",
-            inline=True
-        )
-        
-        embed.add_field(
-            name="⏰ Time Remaining",
-            value=eta,
-            inline=True
-        )
+    snapshot = await warframe_data_manager.get_snapshot()
+    arbitration_data = snapshot.arbitration if snapshot else None
     
+    embed = embed_generator.render(
+        "arbitration", snapshot.version if snapshot else None, None,
+        lambda: EmbedGenerator.create_arbitration_embed(arbitration_data)
+    )
     await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="sortie", description="Show current sortie missions")
@@ -2486,37 +4862,14 @@ async def sortie_command(interaction: discord.Interaction):
     """Display current sortie"""
     await interaction.response.defer()
     
-    sortie_data = await warframe_data_manager.get_sortie()
-    if not sortie_data:
+    snapshot = await warframe_data_manager.get_snapshot()
+    if not snapshot or not snapshot.sortie:
         await interaction.followup.send("❌ No active sortie or failed to fetch information.")
         return
     
-    embed = discord.Embed(title="🎯 Daily Sortie", color=0xFF5722)
-    embed.timestamp = datetime.utcnow()
-    
-    boss = sortie_data.get("boss", "Unknown")
-    faction = sortie_data.get("faction", "Unknown")
-    eta = sortie_data.get("eta", "Unknown")
-    
-    embed.add_field(name="Boss", value=boss, inline=True)
-    embed.add_field(name="Faction", value=faction, inline=True)
-    embed.add_field(name="Time Remaining", value=eta, inline=True)
-    
-    variants = sortie_data.get("variants", [])
-    if variants:
-        mission_list = []
-        for i, variant in enumerate(variants[:3], 1):
-            mission_type = variant.get("missionType", "Unknown")
-            node = variant.get("node", "Unknown")
-            modifier = variant.get("modifier", "Unknown")
-            mission_list.append(f"**{i}.** {mission_type} - {node}\n*{modifier}*")
-        
-        embed.add_field(
-            name="Missions",
-            value="\n\n".join(mission_list),
-            inline=False
-        )
-    
+    embed = embed_generator.render(
+        "sortie", snapshot.version, None, lambda: EmbedGenerator.create_sortie_embed(snapshot.sortie)
+    )
     await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="baro", description="Show Baro Ki'Teer information")
@@ -2524,119 +4877,118 @@ async def baro_command(interaction: discord.Interaction):
     """Display Baro Ki'Teer information"""
     await interaction.response.defer()
     
-    data = await warframe_data_manager.fetch_data()
-    if not data:
+    snapshot = await warframe_data_manager.get_snapshot()
+    if not snapshot:
         await interaction.followup.send("❌ Failed to fetch Baro information.")
         return
     
-    void_trader = data.get("voidTrader", {})
+    void_trader = snapshot.void_trader
     if not void_trader:
         await interaction.followup.send("❌ No Baro Ki'Teer data available.")
         return
     
-    embed = discord.Embed(title="💰 Baro Ki'Teer - Void Trader", color=0xFFD700)
-    embed.timestamp = datetime.utcnow()
-    
-    character = void_trader.get("character", "Unknown")
-    location = void_trader.get("location", "Unknown")
-    
-    if void_trader.get("active", False):
-        embed.add_field(name="Status", value="🟢 **ACTIVE**", inline=True)
-        embed.add_field(name="Location", value=location, inline=True)
-        
-        end_string = void_trader.get("endString", "Unknown")
-        embed.add_field(name="Leaves In", value=end_string, inline=True)
-        
-        # Show inventory
-        inventory = void_trader.get("inventory", [])
-        if inventory:
-            item_list = []
-            for item in inventory[:10]:  # Limit to 10 items
-                item_name = item.get("item", "Unknown")
-                ducats = item.get("ducats", 0)
-                credits = item.get("credits", 0)
-                item_list.append(f"**{item_name}**\n💎 {ducats} Ducats + 💰 {credits:,} Credits")
-            
-            embed.add_field(
-                name=f"🏪 Inventory ({len(inventory)} items)",
-                value="\n\n".join(item_list),
-                inline=False
-            )
-    else:
-        embed.add_field(name="Status", value="🔴 **NOT ACTIVE**", inline=True)
-        
-        start_string = void_trader.get("startString", "Unknown")
-        embed.add_field(name="Next Visit", value=start_string, inline=True)
-        embed.add_field(name="Next Location", value=location, inline=True)
-    
+    embed = embed_generator.render(
+        "baro", snapshot.version, None, lambda: EmbedGenerator.create_baro_embed(void_trader)
+    )
     await interaction.followup.send(embed=embed)
 
+def filter_values_autocomplete(dimension: str):
+    """Autocomplete for comma-separated filter values, completing the last entry"""
+    async def autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        *chosen, partial = (current or "").split(",")
+        chosen = [value.strip().lower() for value in chosen if value.strip()]
+        prefix = "".join(f"{value}," for value in chosen)
+        options = [value for value in FILTER_DIMENSIONS[dimension] if value != "other" and value not in chosen]
+        if not chosen:
+            options.insert(0, "any")
+        return [
+            app_commands.Choice(name=f"{prefix}{value}", value=f"{prefix}{value}")
+            for value in options if value.startswith(partial.strip().lower())
+        ][:25]
+    return autocomplete
+
+def build_subscription_details(event: str, tier: str, mission_type: str, faction: str, kind: str = "any") -> str:
+    """Filter details for fissure events; other events take no filters"""
+    if event not in FISSURE_EVENT_FILTERS:
+        return ""
+    return "|".join(
+        f"{dimension}:{values}"
+        for dimension, values in (("tier", tier), ("mission", mission_type), ("faction", faction), ("kind", kind))
+        if values and values != "any"
+    )
+
+def describe_subscription(event: str, details: str, lead: int = 0) -> str:
+    """Readable name for a subscription, e.g. 'Neo/Axi Survival Missions' or 'Cetus Night (10 min early)'"""
+    filters = parse_filter_details(details)
+    if lead:
+        return f"{event.replace('_', ' ').title()} ({lead} min early)"
+    if event not in FISSURE_EVENT_FILTERS or not filters:
+        return "All Fissure Missions" if event == "fissure_missions" else event.replace("_", " ").title()
+    parts = ["/".join(value.replace("_", " ").title() for value in filters[dimension])
+             for dimension in ("kind", "tier", "mission", "faction")
+             if dimension in filters and dimension not in FISSURE_EVENT_FILTERS[event]]
+    suffix = "Steel Path Fissures" if event == "steel_path_fissures" else "Missions"
+    return " ".join(parts + [suffix])
+
+async def check_reminder_lead(interaction: discord.Interaction, event: str, lead_minutes: int) -> bool:
+    """Reject a lead time for events that can't be predicted; returns False after replying"""
+    if lead_minutes and event not in {rule.event for rule in REMINDER_RULES}:
+        events = ", ".join(rule.event for rule in REMINDER_RULES)
+        await interaction.response.send_message(
+            f"❌ Early reminders are only available for: {events}", ephemeral=True
+        )
+        return False
+    return True
+
 @bot.tree.command(name="subscribe", description="Subscribe to specific Warframe event notifications")
 @app_commands.describe(
     event="Select the main event category",
-    tier="Specify relic tier (for fissure missions)",
-    mission_type="Specify mission type (for fissure missions)"
+    tier="Relic tiers, comma-separated (for fissure missions)",
+    mission_type="Mission types, comma-separated (for fissure missions)",
+    faction="Enemy factions, comma-separated (for fissure missions)",
+    kind="Fissure kinds: normal, steel_path, railjack (for fissure missions)",
+    lead_minutes="Remind me this many minutes before it starts (cycles, Baro, sortie and arbitration)"
 )
 @app_commands.choices(event=[
-    app_commands.Choice(name="Cetus Night (for Eidolon hunting)", value="cetus_night"),
-    app_commands.Choice(name="Fortuna Warm (for resource farming)", value="fortuna_warm"),
-    app_commands.Choice(name="Fissure Missions (specify tier/mission)", value="fissure_missions"),
-    app_commands.Choice(name="Steel Path Fissures", value="steel_path_fissures"),
-    app_commands.Choice(name="Arbitration changes", value="arbitration"),
-])
-@app_commands.choices(tier=[
-    app_commands.Choice(name="Any Tier", value="any"),
-    app_commands.Choice(name="Lith", value="lith"),
-    app_commands.Choice(name="Meso", value="meso"),
-    app_commands.Choice(name="Neo", value="neo"),
-    app_commands.Choice(name="Axi", value="axi"),
-    app_commands.Choice(name="Requiem", value="requiem"),
-])
-@app_commands.choices(mission_type=[
-    app_commands.Choice(name="Any Mission Type", value="any"),
-    app_commands.Choice(name="Survival", value="survival"),
-    app_commands.Choice(name="Capture", value="capture"),
-    app_commands.Choice(name="Exterminate", value="exterminate"),
-    app_commands.Choice(name="Defense", value="defense"),
-    app_commands.Choice(name="Mobile Defense", value="mobile_defense"),
-    app_commands.Choice(name="Spy", value="spy"),
-    app_commands.Choice(name="Rescue", value="rescue"),
-    app_commands.Choice(name="Sabotage", value="sabotage"),
-    app_commands.Choice(name="Interception", value="interception"),
+    app_commands.Choice(name=label, value=event) for event, label in SUBSCRIPTION_EVENTS.items()
 ])
+@app_commands.autocomplete(
+    tier=filter_values_autocomplete("tier"),
+    mission_type=filter_values_autocomplete("mission"),
+    faction=filter_values_autocomplete("faction"),
+    kind=filter_values_autocomplete("kind"),
+)
 async def subscribe_command(
     interaction: discord.Interaction,
     event: str,
     tier: Optional[str] = "any",
-    mission_type: Optional[str] = "any"
+    mission_type: Optional[str] = "any",
+    faction: Optional[str] = "any",
+    kind: Optional[str] = "any",
+    lead_minutes: Optional[app_commands.Range[int, 0, REMINDER_MAX_LEAD_MINUTES]] = 0
 ):
-    """Enhanced subscribe command with tier and mission type filtering"""
+    """Enhanced subscribe command with multi-value tier, mission type and faction filtering"""
     
     # Build the details string for specific filtering
-    details = ""
-    if event == "fissure_missions":
-        details_parts = []
-        if tier != "any":
-            details_parts.append(f"tier:{tier}")
-        if mission_type != "any":
-            details_parts.append(f"mission:{mission_type}")
-        details = "|".join(details_parts)
-        
-        # Create a more readable event type for fissure missions
-        if tier != "any" and mission_type != "any":
-            event_display = f"{tier.title()} {mission_type.title()}"
-        elif tier != "any":
-            event_display = f"{tier.title()} Missions"
-        elif mission_type != "any":
-            event_display = f"{mission_type.title()} Missions"
-        else:
-            event_display = "All Fissure Missions"
-    else:
-        event_display = event.replace("_", " ").title()
+    details = build_subscription_details(event, tier, mission_type, faction, kind)
+    try:
+        details, mask = subscription_manager.compile_details(event, details)
+    except ValueError as e:
+        await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+        return
+    if not await check_reminder_lead(interaction, event, lead_minutes):
+        return
+    event_display = describe_subscription(event, details, lead_minutes)
 
     success = subscription_manager.add_subscription(
-        interaction.user.id, event, details
+        interaction.user.id, event, details, lead_minutes
     )
+    # Arm the reminder now rather than at the next update
+    if success and lead_minutes and reminder_scheduler:
+        reminder_scheduler.sync(warframe_data_manager.cycle_engine, await warframe_data_manager.get_snapshot())
+    # Subscribing again means they want DMs, even if they were closed before
+    if notification_dispatcher:
+        notification_dispatcher.allow_user(interaction.user.id)
 
     if success:
         embed = discord.Embed(
@@ -2650,54 +5002,38 @@ async def subscribe_command(
         try:
             if event == "cetus_night":
                 cycles_data = await warframe_data_manager.get_cycles()
-                cetus = cycles_data.get("cetus", {})
-                if cetus.get("state", "").lower() == "night":
-                    time_left = cetus.get("timeLeft", "unknown")
+                cetus = cycles_data.get("cetus")
+                if cetus and cetus.state.lower() == "night":
                     await interaction.user.send(
                         f"🌙 **Cetus is currently in night cycle!**\n"
-                        f"⏰ {time_left} remaining for Eidolon hunting"
+                        f"⏰ Eidolon hunting ends {format_discord_timestamp(cetus.expiry)}"
                     )
                     notified = True
 
             elif event == "fortuna_warm":
                 cycles_data = await warframe_data_manager.get_cycles()
-                fortuna = cycles_data.get("fortuna", {})
-                if fortuna.get("state", "").lower() == "warm":
-                    time_left = fortuna.get("timeLeft", "unknown")
+                fortuna = cycles_data.get("fortuna")
+                if fortuna and fortuna.state.lower() == "warm":
                     await interaction.user.send(
                         f"🔥 **Orb Vallis is currently warm!**\n"
-                        f"⏰ {time_left} remaining for resource farming"
+                        f"⏰ Resource farming window ends {format_discord_timestamp(fortuna.expiry)}"
                     )
                     notified = True
 
-            elif event == "fissure_missions":
+            elif event in FISSURE_EVENT_FILTERS:
                 fissures = await warframe_data_manager.get_fissures()
-                matching_missions = []
-                
-                for fissure in fissures:
-                    # Check tier filter
-                    if tier != "any" and fissure.get("tier", "").lower() != tier.lower():
-                        continue
-                    
-                    # Check mission type filter
-                    if mission_type != "any" and fissure.get("missionType", "").lower() != mission_type.lower():
-                        continue
-                    
-                    matching_missions.append(fissure)
+                matching_missions = [
+                    fissure for fissure in fissures
+                    if mask & fissure.filter_mask == fissure.filter_mask
+                ]
                 
                 # Send notification for each matching mission
                 for mission in matching_missions[:3]:  # Limit to 3 to avoid spam
-                    node = mission.get("node", "Unknown")
-                    enemy = mission.get("enemy", "Unknown")
-                    eta = mission.get("eta", "Unknown")
-                    m_tier = mission.get("tier", "Unknown")
-                    m_type = mission.get("missionType", "Unknown")
-                    
                     await interaction.user.send(
-                        f"🌀 **{m_tier.title()} {m_type} Mission Active!**\n"
-                        f"📍 {node}\n"
-                        f"🏴 {enemy}\n"
-                        f"⏰ {eta} remaining"
+                        f"🌀 **{mission.tier.title()} {mission.mission_type} Mission Active!**\n"
+                        f"📍 {mission.node}\n"
+                        f"🏴 {mission.enemy}\n"
+                        f"⏰ Ends {format_discord_timestamp(mission.expiry)}"
                     )
                     notified = True
                     
@@ -2723,60 +5059,46 @@ async def subscribe_command(
 @bot.tree.command(name="unsubscribe", description="Unsubscribe from Warframe event notifications")
 @app_commands.describe(
     event="The event type to unsubscribe from",
-    tier="Specify relic tier (for fissure missions)",
-    mission_type="Specify mission type (for fissure missions)"
+    tier="Relic tiers, as subscribed (for fissure missions)",
+    mission_type="Mission types, as subscribed (for fissure missions)",
+    faction="Enemy factions, as subscribed (for fissure missions)",
+    kind="Fissure kinds, as subscribed (for fissure missions)",
+    lead_minutes="Reminder lead time, as subscribed"
 )
 @app_commands.choices(event=[
-    app_commands.Choice(name="Cetus Night (for Eidolon hunting)", value="cetus_night"),
-    app_commands.Choice(name="Fortuna Warm (for resource farming)", value="fortuna_warm"),
-    app_commands.Choice(name="Fissure Missions (specify tier/mission)", value="fissure_missions"),
-    app_commands.Choice(name="Steel Path Fissures", value="steel_path_fissures"),
-    app_commands.Choice(name="Arbitration changes", value="arbitration"),
-])
-@app_commands.choices(tier=[
-    app_commands.Choice(name="Any Tier", value="any"),
-    app_commands.Choice(name="Lith", value="lith"),
-    app_commands.Choice(name="Meso", value="meso"),
-    app_commands.Choice(name="Neo", value="neo"),
-    app_commands.Choice(name="Axi", value="axi"),
-    app_commands.Choice(name="Requiem", value="requiem"),
-])
-@app_commands.choices(mission_type=[
-    app_commands.Choice(name="Any Mission Type", value="any"),
-    app_commands.Choice(name="Survival", value="survival"),
-    app_commands.Choice(name="Capture", value="capture"),
-    app_commands.Choice(name="Exterminate", value="exterminate"),
-    app_commands.Choice(name="Defense", value="defense"),
-    app_commands.Choice(name="Mobile Defense", value="mobile_defense"),
-    app_commands.Choice(name="Spy", value="spy"),
-    app_commands.Choice(name="Rescue", value="rescue"),
-    app_commands.Choice(name="Sabotage", value="sabotage"),
-    app_commands.Choice(name="Interception", value="interception"),
+    app_commands.Choice(name=label, value=event) for event, label in SUBSCRIPTION_EVENTS.items()
 ])
+@app_commands.autocomplete(
+    tier=filter_values_autocomplete("tier"),
+    mission_type=filter_values_autocomplete("mission"),
+    faction=filter_values_autocomplete("faction"),
+    kind=filter_values_autocomplete("kind"),
+)
 async def unsubscribe_command(
     interaction: discord.Interaction,
     event: str,
     tier: Optional[str] = "any",
-    mission_type: Optional[str] = "any"
+    mission_type: Optional[str] = "any",
+    faction: Optional[str] = "any",
+    kind: Optional[str] = "any",
+    lead_minutes: Optional[app_commands.Range[int, 0, REMINDER_MAX_LEAD_MINUTES]] = 0
 ):
-    """Enhanced unsubscribe command with tier and mission type filtering"""
+    """Enhanced unsubscribe command with tier, mission type and faction filtering"""
     
     # Build the details string for specific filtering (same logic as subscribe)
-    details = ""
-    if event == "fissure_missions":
-        details_parts = []
-        if tier != "any":
-            details_parts.append(f"tier:{tier}")
-        if mission_type != "any":
-            details_parts.append(f"mission:{mission_type}")
-        details = "|".join(details_parts)
+    details = build_subscription_details(event, tier, mission_type, faction, kind)
+    try:
+        subscription_manager.compile_details(event, details)
+    except ValueError as e:
+        await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+        return
 
     success = subscription_manager.remove_subscription(
-        interaction.user.id, event, details
+        interaction.user.id, event, details, lead_minutes
     )
 
     if success:
-        event_name = event.replace("_", " ").title()
+        event_name = describe_subscription(event, details, lead_minutes)
         embed = discord.Embed(
             title="✅ Subscription Removed",
             description=f"You will no longer receive notifications for: **{event_name}**",
@@ -2811,22 +5133,187 @@ async def my_subscriptions_command(interaction: discord.Interaction):
         
         for event_type, event_subs in subscriptions.items():
             event_name = event_type.replace("_", " ").title()
-            sub_count = len(event_subs)
             embed.add_field(
                 name=event_name,
-                value=f"{sub_count} subscription{'s' if sub_count != 1 else ''}",
+                value="\n".join(
+                    f"• {describe_subscription(event_type, sub.get('details', ''), sub.get('lead', 0))}"
+                    for sub in event_subs
+                )[:1024],
                 inline=True
             )
+        embed.set_footer(
+            text=f"Delivery: {subscription_manager.get_delivery_mode(interaction.user.id)} (change with /notification-mode)"
+        )
     
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
+@bot.tree.command(name="notification-mode", description="Choose how notification DMs are delivered")
+@app_commands.describe(mode="Digest combines everything from one update into a single DM")
+@app_commands.choices(mode=[
+    app_commands.Choice(name="Digest (one DM per update)", value="digest"),
+    app_commands.Choice(name="Immediate (one DM per notification)", value="immediate"),
+])
+async def notification_mode_command(interaction: discord.Interaction, mode: str):
+    """Set the user's notification delivery mode"""
+    subscription_manager.set_delivery_mode(interaction.user.id, mode)
+    embed = discord.Embed(
+        title="✅ Notification Mode Updated",
+        description=(
+            "You'll get one DM per update, listing everything that matched."
+            if mode == "digest" else
+            "You'll get a separate DM for every notification."
+        ),
+        color=0x4CAF50
+    )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@bot.tree.command(name="set-notification-role", description="Ping a role in a channel for an event instead of DMing each subscriber")
+@app_commands.describe(
+    event="The event to announce",
+    role="Role to mention; members can self-assign it with /notify-role",
+    channel="Channel to post the announcement in",
+    tier="Relic tiers, comma-separated (for fissure missions)",
+    mission_type="Mission types, comma-separated (for fissure missions)",
+    faction="Enemy factions, comma-separated (for fissure missions)",
+    kind="Fissure kinds: normal, steel_path, railjack (for fissure missions)"
+)
+@app_commands.choices(event=[
+    app_commands.Choice(name=label, value=event) for event, label in SUBSCRIPTION_EVENTS.items()
+])
+@app_commands.autocomplete(
+    tier=filter_values_autocomplete("tier"),
+    mission_type=filter_values_autocomplete("mission"),
+    faction=filter_values_autocomplete("faction"),
+    kind=filter_values_autocomplete("kind"),
+)
+@app_commands.default_permissions(administrator=True)
+async def set_notification_role_command(
+    interaction: discord.Interaction,
+    event: str,
+    role: discord.Role,
+    channel: discord.TextChannel,
+    tier: Optional[str] = "any",
+    mission_type: Optional[str] = "any",
+    faction: Optional[str] = "any",
+    kind: Optional[str] = "any"
+):
+    """Map an event to a role ping in one of this server's channels"""
+    if not interaction.guild:
+        await interaction.response.send_message("❌ This command only works in a server.", ephemeral=True)
+        return
+
+    details = build_subscription_details(event, tier, mission_type, faction, kind)
+    try:
+        details, _ = subscription_manager.compile_details(event, details)
+    except ValueError as e:
+        await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+        return
+
+    role_broadcast_manager.set_broadcast(interaction.guild.id, event, details, role.id, channel.id)
+    embed = discord.Embed(
+        title="✅ Notification Role Set",
+        description=f"**{describe_subscription(event, details)}** will now mention {role.mention} in {channel.mention}",
+        color=0x4CAF50
+    )
+    embed.add_field(
+        name="Self-assign",
+        value="Members can toggle the role with `/notify-role`.",
+        inline=False
+    )
+    await interaction.response.send_message(embed=embed)
+
+@bot.tree.command(name="remove-notification-role", description="Stop pinging a role for an event")
+@app_commands.describe(
+    event="The event to stop announcing",
+    tier="Relic tiers, as configured (for fissure missions)",
+    mission_type="Mission types, as configured (for fissure missions)",
+    faction="Enemy factions, as configured (for fissure missions)",
+    kind="Fissure kinds, as configured (for fissure missions)"
+)
+@app_commands.choices(event=[
+    app_commands.Choice(name=label, value=event) for event, label in SUBSCRIPTION_EVENTS.items()
+])
+@app_commands.autocomplete(
+    tier=filter_values_autocomplete("tier"),
+    mission_type=filter_values_autocomplete("mission"),
+    faction=filter_values_autocomplete("faction"),
+    kind=filter_values_autocomplete("kind"),
+)
+@app_commands.default_permissions(administrator=True)
+async def remove_notification_role_command(
+    interaction: discord.Interaction,
+    event: str,
+    tier: Optional[str] = "any",
+    mission_type: Optional[str] = "any",
+    faction: Optional[str] = "any",
+    kind: Optional[str] = "any"
+):
+    """Remove an event's role ping from this server"""
+    if not interaction.guild:
+        await interaction.response.send_message("❌ This command only works in a server.", ephemeral=True)
+        return
+
+    details = build_subscription_details(event, tier, mission_type, faction, kind)
+    try:
+        removed = role_broadcast_manager.remove_broadcast(interaction.guild.id, event, details)
+    except ValueError as e:
+        await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+        return
+
+    if removed:
+        await interaction.response.send_message(f"✅ Removed the role ping for **{describe_subscription(event, details)}**.")
+    else:
+        await interaction.response.send_message("❌ No role ping is configured for that event.", ephemeral=True)
+
+async def notify_role_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """This server's notification roles"""
+    if not interaction.guild or not role_broadcast_manager:
+        return []
+    choices = []
+    for broadcast in role_broadcast_manager.get_guild_broadcasts(interaction.guild.id):
+        role = interaction.guild.get_role(broadcast["role_id"])
+        if not role:
+            continue
+        name = f"{describe_subscription(broadcast['event'], broadcast['details'])} (@{role.name})"
+        if current.lower() in name.lower():
+            choices.append(app_commands.Choice(name=name[:100], value=str(role.id)))
+    return choices[:25]
+
+@bot.tree.command(name="notify-role", description="Join or leave one of this server's notification roles")
+@app_commands.describe(role="The notification role to toggle")
+@app_commands.autocomplete(role=notify_role_autocomplete)
+async def notify_role_command(interaction: discord.Interaction, role: str):
+    """Self-assign a role that an admin mapped to an event with /set-notification-role"""
+    if not interaction.guild:
+        await interaction.response.send_message("❌ This command only works in a server.", ephemeral=True)
+        return
+
+    # Only roles that are mapped to an event can be self-assigned
+    role_ids = {broadcast["role_id"] for broadcast in role_broadcast_manager.get_guild_broadcasts(interaction.guild.id)}
+    guild_role = interaction.guild.get_role(int(role)) if role.isdigit() else None
+    if not guild_role or guild_role.id not in role_ids:
+        await interaction.response.send_message("❌ That is not a notification role in this server.", ephemeral=True)
+        return
+
+    member = interaction.user
+    try:
+        if guild_role in member.roles:
+            await member.remove_roles(guild_role, reason="Notification role opt-out")
+            message = f"🔕 Removed {guild_role.mention}; you will no longer be pinged."
+        else:
+            await member.add_roles(guild_role, reason="Notification role opt-in")
+            message = f"🔔 Added {guild_role.mention}; you will be pinged for its announcements."
+    except discord.Forbidden:
+        message = "❌ I don't have permission to manage that role (it must be below my highest role)."
+    await interaction.response.send_message(message, ephemeral=True)
+
 @bot.tree.command(name="wf-status", description="Show overall Warframe worldstate status")
 async def wf_status_command(interaction: discord.Interaction):
     """Display overall worldstate status"""
     await interaction.response.defer()
     
-    data = await warframe_data_manager.fetch_data()
-    if not data:
+    snapshot = await warframe_data_manager.get_snapshot()
+    if not snapshot:
         embed = discord.Embed(
             title="❌ API Status",
             description="Failed to connect to Warframe API",
@@ -2841,32 +5328,14 @@ async def wf_status_command(interaction: discord.Interaction):
         embed.timestamp = datetime.utcnow()
         
         # Count active items
-        counts = {
-            "Fissures": len(data.get("fissures", [])),
-            "Invasions": len(data.get("invasions", [])),
-            "Events": len(data.get("events", [])),
-            "Alerts": len(data.get("alerts", [])),
-            "Kuva Missions": len(data.get("kuva", [])),
-        }
-        
-        for item_type, count in counts.items():
+        for item_type, count in snapshot.counts.items():
             embed.add_field(name=item_type, value=str(count), inline=True)
         
         # Check if major systems are active
-        systems = []
-        if data.get("sortie"):
-            systems.append("Sortie")
-        if data.get("arbitration"):
-            systems.append("Arbitration")
-        if data.get("archonHunt"):
-            systems.append("Archon Hunt") 
-        if data.get("nightwave"):
-            systems.append("Nightwave")
-        
-        if systems:
+        if snapshot.active_systems:
             embed.add_field(
                 name="🟢 Active Systems",
-                value=", ".join(systems),
+                value=", ".join(snapshot.active_systems),
                 inline=False
             )
     
@@ -2956,6 +5425,8 @@ async def api_status_command(interaction: discord.Interaction):
     else:
         embed.description = "❌ **All APIs Unavailable**"
     
+    circuit_icons = {"closed": "🟢", "half_open": "🟡", "open": "🔴"}
+    
     for i, endpoint in enumerate(warframe_data_manager.api_endpoints):
         status_icon = "✅" if endpoint["status"] == "working" else "❌"
         failure_count = warframe_data_manager.api_failure_count.get(i, 0)
@@ -2964,14 +5435,79 @@ async def api_status_command(interaction: discord.Interaction):
         if failure_count > 0:
             status_text += f" ({failure_count} failures)"
         
+        breaker = warframe_data_manager.circuit_breakers[i]
+        status_text += f"\nCircuit: {circuit_icons.get(breaker.state, '')} {breaker.state.replace('_', '-')}"
+        if breaker.state == CircuitBreaker.OPEN:
+            status_text += f" (probe <t:{int(breaker.retry_at)}:R>)"
+        
+        stats = warframe_data_manager.endpoint_stats[i]
+        if stats.samples:
+            latency_text = (
+                f"Latency: {stats.latency_ewma:.2f}s avg, {stats.p95():.2f}s p95\n"
+                f"Success: {stats.success_rate:.0%} ({stats.samples} samples)"
+            )
+        else:
+            latency_text = "Latency: no samples yet"
+        
         embed.add_field(
             name=f"{status_icon} {endpoint['name']}",
-            value=f"Type: {endpoint['type']}\nStatus: {status_text}",
+            value=f"Type: {endpoint['type']}\nStatus: {status_text}\n{latency_text}",
             inline=True
         )
     
+    transitions = list(warframe_data_manager.circuit_transitions)[-5:]
+    if transitions:
+        embed.add_field(
+            name="🔌 Recent Circuit Transitions",
+            value="\n".join(
+                f"<t:{int(changed_at.timestamp())}:t> {name}: {old_state} → {new_state}"
+                for changed_at, name, old_state, new_state in transitions
+            ),
+            inline=False
+        )
+    
+    # Show how much caching and request coalescing are saving us
+    fetch_calls = bot_metrics.get("worldstate.fetch_calls")
+    coalesced = bot_metrics.get("worldstate.coalesced_calls")
+    embed.add_field(
+        name="📉 Caching & Coalescing",
+        value=(
+            f"Calls: {fetch_calls}\n"
+            f"Cache hits: {bot_metrics.get('worldstate.cache_hits')}\n"
+            f"Coalesced: {coalesced}\n"
+            f"Stale hits: {bot_metrics.get('worldstate.stale_hits')}\n"
+            f"Not modified (304): {bot_metrics.get('worldstate.not_modified')}\n"
+            f"Network fetches: {bot_metrics.get('worldstate.network_fetches')}\n"
+            f"Hedged requests: {bot_metrics.get('worldstate.hedged_requests')}"
+        ),
+        inline=False
+    )
+    
     await interaction.response.send_message(embed=embed)
 
+@bot.tree.command(name="bot-metrics", description="Show internal performance metrics")
+@app_commands.default_permissions(administrator=True)
+async def bot_metrics_command(interaction: discord.Interaction):
+    """Display runtime metrics grouped by subsystem"""
+    embed = discord.Embed(title="📈 Bot Metrics", color=0x2196F3)
+    embed.timestamp = datetime.utcnow()
+    
+    uptime_minutes = int((time.time() - bot_metrics.started) / 60)
+    embed.description = f"Uptime: {uptime_minutes} minutes"
+    
+    for prefix in bot_metrics.prefixes()[:25]:
+        lines = bot_metrics.format_lines(prefix)
+        embed.add_field(
+            name=prefix.replace("_", " ").title(),
+            value="\n".join(lines)[:1024] or "No data",
+            inline=False
+        )
+    
+    if not embed.fields:
+        embed.add_field(name="No Data", value="No metrics recorded yet", inline=False)
+    
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
 
 @bot.tree.command(name="list_users", description="List users who have relic data stored")
 async def list_users(interaction):
@@ -3080,23 +5616,84 @@ async def cleanup_messages_command(interaction: discord.Interaction):
 async def setup_warframe_extension():
     """Setup the enhanced Warframe information extension"""
     global warframe_data_manager, subscription_manager, embed_generator, notification_manager, channel_manager
+    global update_pipeline, notification_dispatcher, reminder_scheduler, role_broadcast_manager
     
     try:
         # Initialize enhanced Warframe information system components
-        warframe_data_manager = WarframeDataManager()
-        subscription_manager = SubscriptionManager(bot)
+        warframe_data_manager = WarframeDataManager(http_client_manager)
+        # Keep the one database connection and writer thread across reconnects
+        if subscription_manager is None:
+            subscription_manager = SubscriptionManager(bot)
+        role_broadcast_manager = RoleBroadcastManager(bot)
         embed_generator = EmbedGenerator()
-        notification_manager = NotificationManager(bot, subscription_manager)
-        channel_manager = ChannelManager(bot)
+        # on_ready can fire again after a reconnect; keep the one queue and its workers
+        if notification_dispatcher is None:
+            notification_dispatcher = NotificationDispatcher(bot, user_cache)
+            notification_dispatcher.start()
+        notification_manager = NotificationManager(
+            bot, subscription_manager, notification_dispatcher, SeenEventStore(), role_broadcast_manager
+        )
+        # Pending write-behind state lives on the instance, so keep it across reconnects
+        if channel_manager is None:
+            channel_manager = ChannelManager(bot)
+        if reminder_scheduler:
+            await reminder_scheduler.stop()
+        reminder_scheduler = ReminderScheduler(subscription_manager, notification_manager)
+        reminder_scheduler.start()
+        update_pipeline = UpdatePipeline(
+            warframe_data_manager, WorldstateDiffer(), channel_manager, embed_generator, reminder_scheduler
+        )
+        notification_manager.subscribe_to(update_pipeline.differ)
+        
+        # Open pooled connections before the first update tick needs them
+        await http_client_manager.warm_up()
+        
+        # Node and sortie names for the raw DE worldstate endpoint
+        tables = load_worldstate_tables()
+        if tables is None:
+            try:
+                tables = await fetch_and_save_worldstate_tables()
+            except Exception as e:
+                logging.warning(f"⚠️ Could not download worldstate tables, raw endpoint will show raw codes: {e}")
+        if tables:
+            warframe_data_manager.raw_normalizer.load_tables(tables)
+        
+        # Adopt existing panel messages once, before the loop starts editing by id
+        adopted = await channel_manager.reconcile()
+        logging.info(f"🔎 Channel reconciliation adopted {adopted} existing panel message(s)")
         
         # Start the Warframe info update task
         warframe_info_update_loop.start()
         
+        # Start probing failed API endpoints in the background
+        if not api_health_probe_loop.is_running():
+            api_health_probe_loop.start()
+        
         logging.info("✅ Enhanced Warframe information extension loaded successfully")
         
     except Exception as e:
         logging.error(f"❌ Failed to load enhanced Warframe information extension: {e}")
 
+async def shutdown_warframe_extension():
+    """Release resources held by the Warframe information extension"""
+    try:
+        # Persist undelivered DMs before the connections go away
+        if notification_manager:
+            notification_manager.flush_digests(force=True)
+            await notification_manager.seen_events.close()
+        if reminder_scheduler:
+            await reminder_scheduler.stop()
+        if notification_dispatcher:
+            await notification_dispatcher.stop()
+        if subscription_manager:
+            await subscription_manager.close()
+        if channel_manager:
+            await channel_manager.flush()
+        await price_cache_store.flush()
+        await http_client_manager.close()
+    except Exception as e:
+        logging.error(f"❌ Error shutting down Warframe information extension: {e}")
+
 @bot.event
 async def on_ready():
     logging.info(f"Enhanced Warframe bot logged in as {bot.user} (ID: {bot.user.id})")